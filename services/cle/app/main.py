@@ -27,14 +27,16 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
 
 from shared.models import (
     PaymentTransaction, Invoice, MatchResult, DocumentParsingResult, 
-    CommunicationRequest, TransactionStatus, DiscrepancyCode
+    CommunicationRequest, TransactionStatus, DiscrepancyCode,
+    APPLIED_TRANSACTION_STATUSES, PAYABLE_INVOICE_STATUSES, InvoiceListAdapter
 )
 from shared.request_models import ProcessTransactionRequest, ProcessTransactionResponse
 from shared.logging_config import get_logger, set_correlation_id, get_correlation_id
 from shared.exception import ProcessingError, ERPIntegrationError, DocumentIntelligenceError
 from shared.database import get_db_manager
 from shared.monitoring import MetricsCollector, BusinessMetricsTracker
-from shared.health import HealthChecker, check_database_connection, check_http_service
+from shared.health import HealthChecker, check_database_connection, check_http_service, close_http_client
+from shared.db_pool import close_pools
 from shared.auth import auth_middleware, require_transaction_access, AuthenticatedHttpClient
 from shared.security import (
     setup_security_middleware, get_current_user, require_permission,
@@ -150,7 +152,7 @@ class PaymentMatchingEngine:
             await self._persist_match_result(match_result)
             
             processing_time = (time.time() - start_time) * 1000  # Convert to milliseconds
-            match_result.processing_time_ms = int(processing_time)
+            match_result = match_result.model_copy(update={'processing_time_ms': int(processing_time)})
             
             # Track business metrics
             business_tracker.track_transaction_processed(
@@ -321,14 +323,14 @@ class PaymentMatchingEngine:
             response.raise_for_status()
             
             data = response.json()
-            invoices = [Invoice(**invoice_data) for invoice_data in data.get("invoices", [])]
+            invoices = InvoiceListAdapter.validate_python(data.get("invoices", []))
             
             # Filter for valid invoices (open, correct currency, positive amount)
             valid_invoices = [
                 inv for inv in invoices 
                 if inv.currency == currency 
                 and inv.amount_due > 0 
-                and inv.status in ['open', 'overdue']
+                and inv.status in PAYABLE_INVOICE_STATUSES
             ]
             
             logger.info("ERP invoice fetch completed", extra={
@@ -480,7 +482,7 @@ class PaymentMatchingEngine:
         actions = []
         
         # ERP Updates for successful matches
-        if match_result.status in [TransactionStatus.MATCHED, TransactionStatus.PARTIALLY_MATCHED]:
+        if match_result.status in APPLIED_TRANSACTION_STATUSES:
             if match_result.matched_pairs:
                 actions.append(self._update_erp_system(match_result))
         
@@ -605,52 +607,54 @@ class PaymentMatchingEngine:
     async def _persist_match_result(self, match_result: MatchResult):
         """Persist match result to database"""
         try:
-            # Insert match result
-            insert_query = """
-                INSERT INTO match_results (
-                    transaction_id, status, unapplied_amount, discrepancy_code,
-                    log_entry, confidence_score, processing_time_ms, requires_human_review
-                ) VALUES (
-                    (SELECT id FROM payment_transactions WHERE transaction_id = $1),
-                    $2, $3, $4, $5, $6, $7, $8
-                ) RETURNING id
-            """
-            
-            result = await self.db.execute_query(
-                insert_query,
-                match_result.transaction_id,
-                match_result.status.value,
-                match_result.unapplied_amount,
-                match_result.discrepancy_code.value if match_result.discrepancy_code else None,
-                match_result.log_entry,
-                match_result.confidence_score,
-                match_result.processing_time_ms,
-                match_result.requires_human_review
-            )
-            
-            if result:
-                match_result_id = result[0]['id']
+            # The result row and its invoice matches go through one connection
+            async with self.db.pinned_connection():
+                # Insert match result
+                insert_query = """
+                    INSERT INTO match_results (
+                        transaction_id, status, unapplied_amount, discrepancy_code,
+                        log_entry, confidence_score, processing_time_ms, requires_human_review
+                    ) VALUES (
+                        (SELECT id FROM payment_transactions WHERE transaction_id = $1),
+                        $2, $3, $4, $5, $6, $7, $8
+                    ) RETURNING id
+                """
                 
-                # Insert invoice matches
-                if match_result.matched_pairs:
-                    for invoice_id, amount in match_result.matched_pairs.items():
-                        await self.db.execute_command(
-                            """
-                            INSERT INTO invoice_payment_matches (
-                                match_result_id, invoice_id, amount_applied, external_invoice_id
-                            ) VALUES (
-                                $1,
-                                (SELECT id FROM invoices WHERE invoice_id = $2 LIMIT 1),
-                                $3, $2
-                            )
-                            """,
-                            match_result_id, invoice_id, amount
-                        )
+                result = await self.db.execute_query(
+                    insert_query,
+                    match_result.transaction_id,
+                    match_result.status.value,
+                    match_result.unapplied_amount,
+                    match_result.discrepancy_code.value if match_result.discrepancy_code else None,
+                    match_result.log_entry,
+                    match_result.confidence_score,
+                    match_result.processing_time_ms,
+                    match_result.requires_human_review
+                )
                 
-                logger.info("Match result persisted", extra={
-                    'transaction_id': match_result.transaction_id,
-                    'match_result_id': str(match_result_id)
-                })
+                if result:
+                    match_result_id = result[0]['id']
+                    
+                    # Insert invoice matches
+                    if match_result.matched_pairs:
+                        for invoice_id, amount in match_result.matched_pairs.items():
+                            await self.db.execute_command(
+                                """
+                                INSERT INTO invoice_payment_matches (
+                                    match_result_id, invoice_id, amount_applied, external_invoice_id
+                                ) VALUES (
+                                    $1,
+                                    (SELECT id FROM invoices WHERE invoice_id = $2 LIMIT 1),
+                                    $3, $2
+                                )
+                                """,
+                                match_result_id, invoice_id, amount
+                            )
+                    
+                    logger.info("Match result persisted", extra={
+                        'transaction_id': match_result.transaction_id,
+                        'match_result_id': str(match_result_id)
+                    })
         
         except Exception as e:
             logger.error("Failed to persist match result", extra={
@@ -691,6 +695,8 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down Core Logic Engine")
     await auth_http_client.close()
+    await close_http_client()
+    await close_pools()
     logger.info("Core Logic Engine shutdown complete")
 
 
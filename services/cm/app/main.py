@@ -11,9 +11,10 @@ from fastapi.middleware.gzip import GZipMiddleware
 
 from shared.models import MatchResult, HealthResponse
 from shared.logging_config import get_logger, correlation_id_middleware
-from shared.health import HealthChecker
+from shared.health import HealthChecker, close_http_client
+from shared.db_pool import close_pools
 from shared.exceptions import CommunicationError
-from shared.metrics import MetricsCollector
+from shared.metrics import MetricsCollector, metrics_middleware
 
 from .services.email_service import EmailService
 from .services.slack_client import SlackClient
@@ -49,6 +50,7 @@ async def lifespan(app: FastAPI):
     
     # Initialize metrics
     metrics = MetricsCollector(service_name="cm")
+    metrics.start()
     
     # Initialize health checker
     health_checker = HealthChecker(service_name="cm")
@@ -88,6 +90,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down CM service...")
+    await close_http_client()
+    await close_pools()
+    await metrics.aclose()
 
 async def _test_connections():
     """Test connections to external services"""
@@ -122,6 +127,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.middleware("http")(correlation_id_middleware)
+app.middleware("http")(metrics_middleware(lambda: metrics))
 
 # Dependencies
 def get_email_service() -> EmailService:
@@ -169,10 +169,10 @@ class EmailService:
         # Prepare template context
         context = {
             'customer_name': customer_info.get('name', 'Valued Customer'),
-            'payment_amount': sum(match_result.matched_pairs.values()) if match_result.matched_pairs else 0,
+            'payment_amount': match_result.total_applied,
             'currency': 'USD',  # Should be dynamic
             'transaction_id': match_result.transaction_id,
-            'matched_invoices': list(match_result.matched_pairs.keys()),
+            'matched_invoices': list(match_result.matched_invoice_ids),
             'discrepancy_code': match_result.discrepancy_code,
             'unapplied_amount': float(match_result.unapplied_amount),
             'company_name': self.settings.get('company_name', 'Your Company'),
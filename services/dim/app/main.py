@@ -11,9 +11,10 @@ from fastapi.middleware.gzip import GZipMiddleware
 
 from shared.models import DocumentParseRequest, DocumentParseResult, HealthResponse
 from shared.logging_config import get_logger, correlation_id_middleware
-from shared.health import HealthChecker
+from shared.health import HealthChecker, close_http_client
+from shared.db_pool import close_pools
 from shared.exceptions import DIMProcessingError
-from shared.metrics import MetricsCollector
+from shared.metrics import MetricsCollector, metrics_middleware
 
 from .models.document_processor import DocumentIntelligenceService
 from .config import DIMSettings
@@ -39,6 +40,7 @@ async def lifespan(app: FastAPI):
     
     # Initialize metrics
     metrics = MetricsCollector(service_name="dim")
+    metrics.start()
     
     # Initialize health checker
     health_checker = HealthChecker(service_name="dim")
@@ -58,6 +60,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down DIM service...")
+    await close_http_client()
+    await close_pools()
+    await metrics.aclose()
 
 async def _warmup_models():
     """Warm up ML models by loading them into GPU memory"""
@@ -87,6 +92,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.middleware("http")(correlation_id_middleware)
+app.middleware("http")(metrics_middleware(lambda: metrics))
 
 # Dependency to get document intelligence service
 def get_doc_service() -> DocumentIntelligenceService:
@@ -27,6 +27,7 @@ from prometheus_client import Counter, Histogram, Gauge, generate_latest
 from shared.logging import setup_logging, get_correlation_id, log_context
 from shared.database import DatabaseManager
 from shared.models import HealthResponse
+from shared.metrics import BUCKETS_PROCESSING_SECONDS, BUCKETS_RATIO
 
 # Import new three-tier document intelligence system
 import sys
@@ -49,7 +50,7 @@ PROCESSING_DURATION = Histogram(
     'dim_processing_duration_seconds',
     'Document processing duration',
     ['stage', 'model_type'],
-    buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0]
+    buckets=BUCKETS_PROCESSING_SECONDS
 )
 
 MODEL_INFERENCE_TIME = Histogram(
@@ -61,7 +62,7 @@ MODEL_INFERENCE_TIME = Histogram(
 CONFIDENCE_SCORE = Histogram(
     'dim_confidence_score',
     'Extraction confidence scores',
-    buckets=[0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+    buckets=BUCKETS_RATIO
 )
 
 ACTIVE_PROCESSING_JOBS = Gauge(
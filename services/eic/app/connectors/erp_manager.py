@@ -246,7 +246,7 @@ class ERPManager:
             Application result
         """
         # Determine ERP system based on invoice ID patterns
-        target_system = await self._detect_erp_system(list(match_result.matched_pairs.keys()))
+        target_system = await self._detect_erp_system(list(match_result.matched_invoice_ids))
         
         if target_system:
             return await self.post_application_to_system(target_system, match_result, idempotency_key)
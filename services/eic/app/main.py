@@ -12,9 +12,10 @@ from fastapi.middleware.gzip import GZipMiddleware
 
 from shared.models import Invoice, MatchResult, HealthResponse
 from shared.logging_config import get_logger, correlation_id_middleware
-from shared.health import HealthChecker
+from shared.health import HealthChecker, close_http_client
+from shared.db_pool import close_pools
 from shared.exceptions import ERPConnectionError, ERPAuthenticationError, ERPDataError
-from shared.metrics import MetricsCollector
+from shared.metrics import MetricsCollector, metrics_middleware
 
 from .connectors.erp_manager import ERPManager
 # Note: Other imports commented out as files don't exist yet
@@ -44,6 +45,7 @@ async def lifespan(app: FastAPI):
     
     # Initialize metrics
     metrics = MetricsCollector(service_name="eic")
+    metrics.start()
     
     # Initialize health checker
     health_checker = HealthChecker(service_name="eic")
@@ -68,6 +70,9 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down EIC service...")
     if erp_manager:
         await erp_manager.cleanup()
+    await close_http_client()
+    await close_pools()
+    await metrics.aclose()
 
 # Create FastAPI app
 app = FastAPI(
@@ -87,6 +92,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.middleware("http")(correlation_id_middleware)
+app.middleware("http")(metrics_middleware(lambda: metrics))
 
 # Dependencies  
 def get_erp_manager():
@@ -8,7 +8,8 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
-from shared.health import HealthChecker
+from shared.health import HealthChecker, close_http_client
+from shared.db_pool import close_pools
 from shared.metrics import MetricsCollector
 from shared.logging_config import get_logger
 
@@ -37,6 +38,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down EIC service...")
+    await close_http_client()
+    await close_pools()
 
 # Create FastAPI app
 app = FastAPI(
@@ -6,14 +6,115 @@ Centralized database operations for CashAppAgent
 
 import asyncio
 import asyncpg
-from typing import List, Dict, Any, Optional
+import base64
+import datetime
+import decimal
+import hashlib
+import itertools
+import json
+import logging
+import re
+import uuid
+from typing import TYPE_CHECKING, List, Dict, Any, Iterable, NamedTuple, Optional, Set
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from urllib.parse import urlparse, unquote
 import os
 from .logging import setup_logging
 from .exceptions import CashAppException
+from .metrics import ACTIVE_CONNECTIONS
+
+if TYPE_CHECKING:
+    # Only the optional result cache uses Redis, and callers pass the client in
+    import redis.asyncio as redis
 
 logger = setup_logging("database-utils")
 
+# Tables referenced by a read query / modified by a write command. Writes are
+# matched anywhere in the statement so data-modifying CTEs are picked up too.
+_TABLE_NAME = r'((?:"[^"]+"|\w+)(?:\s*\.\s*(?:"[^"]+"|\w+))*)'
+_READ_TABLES_RE = re.compile(r'\b(?:FROM|JOIN)\s+(?:ONLY\s+)?' + _TABLE_NAME, re.IGNORECASE)
+_WRITE_TABLES_RE = re.compile(
+    r'\b(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM|TRUNCATE(?:\s+TABLE)?|MERGE\s+INTO)\s+(?:ONLY\s+)?' + _TABLE_NAME,
+    re.IGNORECASE
+)
+_IDENTIFIER_RE = re.compile(r'"([^"]+)"|(\w+)')
+
+# Type tag for cached values JSON can't represent natively
+_CACHE_TYPE_KEY = "__db_type__"
+_CACHE_ENCODERS = (
+    (decimal.Decimal, "decimal", str),
+    (datetime.datetime, "datetime", datetime.datetime.isoformat),
+    (datetime.date, "date", datetime.date.isoformat),
+    (datetime.time, "time", datetime.time.isoformat),
+    (datetime.timedelta, "timedelta", datetime.timedelta.total_seconds),
+    (uuid.UUID, "uuid", str),
+    (bytes, "bytes", lambda value: base64.b64encode(value).decode("ascii")),
+)
+_CACHE_DECODERS = {
+    "decimal": decimal.Decimal,
+    "datetime": datetime.datetime.fromisoformat,
+    "date": datetime.date.fromisoformat,
+    "time": datetime.time.fromisoformat,
+    "timedelta": lambda value: datetime.timedelta(seconds=value),
+    "uuid": uuid.UUID,
+    "bytes": base64.b64decode,
+}
+
+
+def _encode_cached_value(value: Any) -> Dict[str, Any]:
+    """json.dumps default: tag values so they decode back to the same type"""
+    for cls, tag, encode in _CACHE_ENCODERS:
+        if isinstance(value, cls):
+            return {_CACHE_TYPE_KEY: tag, "v": encode(value)}
+    # Unknown types are not cached rather than coming back as strings
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _decode_cached_value(obj: Dict[str, Any]) -> Any:
+    """json.loads object_hook: restore values tagged by _encode_cached_value"""
+    tag = obj.get(_CACHE_TYPE_KEY)
+    if tag is not None and len(obj) == 2 and "v" in obj:
+        return _CACHE_DECODERS[tag](obj["v"])
+    return obj
+
+
+def _normalize_table(name: str) -> str:
+    """
+    Reduce a table reference to the tag used for cache invalidation
+    
+    Quoting, case and schema qualification are dropped so that `"Invoices"`,
+    `invoices` and `public.invoices` share one tag; distinct tables that only
+    differ in those collapse too, which over-invalidates but never serves stale rows.
+    """
+    parts = [quoted or bare for quoted, bare in _IDENTIFIER_RE.findall(name)]
+    return parts[-1].lower()
+
+
+def _referenced_tables(pattern: re.Pattern, sql: str) -> Set[str]:
+    """Normalized names of the tables matched by pattern in sql"""
+    return {_normalize_table(name) for name in pattern.findall(sql)}
+
+# Plain positional INSERT that can be replayed through COPY
+_COPYABLE_INSERT_RE = re.compile(
+    r'^\s*INSERT\s+INTO\s+(?:(\w+)\.)?(\w+)\s*\(([^)]+)\)\s*VALUES\s*\(([$\d\s,]+)\)\s*;?\s*$',
+    re.IGNORECASE
+)
+COPY_THRESHOLD = 100
+
+
+class _PinnedConnection(NamedTuple):
+    """Connection held by one task for the length of a pinned_connection() block"""
+    manager: 'DatabaseManager'
+    task: Optional[asyncio.Task]
+    connection: Any
+    statements: Dict[str, Any]
+
+
+# Set inside DatabaseManager.pinned_connection(); child tasks inherit the value
+# but never match its task, so they go back to the pool
+_pinned_connection: ContextVar[Optional[_PinnedConnection]] = ContextVar('db_pinned_connection', default=None)
+
 
 class DatabaseManager:
     """
@@ -21,20 +122,39 @@ class DatabaseManager:
     Handles connection pooling and common database operations
     """
     
-    def __init__(self, connection_string: str, min_connections: int = 5, max_connections: int = 20):
+    def __init__(self, connection_string: str, min_connections: Optional[int] = None, max_connections: Optional[int] = None,
+                 redis_client: Optional['redis.Redis'] = None):
         self.connection_string = connection_string
+        # Parsed and validated once; the pool connects with these keyword arguments
+        self.connect_params = get_database_dsn_parts(connection_string)
+        if min_connections is None:
+            min_connections = int(os.getenv('DB_POOL_MIN', '5'))
+        if max_connections is None:
+            max_connections = int(os.getenv('DB_POOL_MAX', '20'))
         self.min_connections = min_connections
         self.max_connections = max_connections
+        # Prepared statement cache; set DB_STATEMENT_CACHE_SIZE=0 when queries mix
+        # parameter distributions that make a cached generic plan slow
+        self.statement_cache_size = int(os.getenv('DB_STATEMENT_CACHE_SIZE', '256'))
+        self.max_cached_statement_lifetime = int(os.getenv('DB_MAX_CACHED_STATEMENT_LIFETIME', '300'))
         self.pool = None
+        # Optional result cache for read-heavy lookup queries
+        self.redis = redis_client
     
     async def initialize(self):
         """Initialize database connection pool"""
         try:
             self.pool = await asyncpg.create_pool(
-                self.connection_string,
+                **self.connect_params,
                 min_size=self.min_connections,
                 max_size=self.max_connections,
-                command_timeout=60
+                command_timeout=60,
+                statement_cache_size=self.statement_cache_size,
+                max_cached_statement_lifetime=self.max_cached_statement_lifetime,
+                # Keep warm connections open; asyncpg already opens min_size on creation
+                max_inactive_connection_lifetime=0,
+                # JIT compilation adds latency to short OLTP queries
+                server_settings={'jit': os.getenv('DB_JIT', 'off')}
             )
             logger.info("Database connection pool initialized", 
                        extra={"min_connections": self.min_connections, 
@@ -42,7 +162,7 @@ class DatabaseManager:
         except Exception as e:
             logger.error("Failed to initialize database pool", 
                         extra={"error": str(e)})
-            raise CashAppException(f"Database initialization failed: {e}", "DATABASE_INIT_ERROR")
+            raise CashAppException("Database initialization failed", "DATABASE_INIT_ERROR", cause=e) from e
     
     async def close(self):
         """Close database connection pool"""
@@ -51,33 +171,190 @@ class DatabaseManager:
             logger.info("Database connection pool closed")
     
     @asynccontextmanager
-    async def get_connection(self):
-        """Get database connection from pool"""
+    async def get_connection(self, timeout: float = 10.0):
+        """
+        Get database connection from pool
+        
+        Inside pinned_connection() this yields the pinned connection.
+        
+        Args:
+            timeout: Seconds to wait for a free connection before failing
+        """
+        pinned = self._current_pin()
+        if pinned is not None:
+            yield pinned.connection
+            return
+        
         if not self.pool:
             raise CashAppException("Database pool not initialized", "DATABASE_POOL_ERROR")
         
-        async with self.pool.acquire() as connection:
+        waiting = ACTIVE_CONNECTIONS.labels(service="database-utils", connection_type="db_pool_waiting")
+        waiting.inc()
+        try:
+            connection = await self.pool.acquire(timeout=timeout)
+        except asyncio.TimeoutError as e:
+            raise CashAppException(
+                f"No database connection available within {timeout}s",
+                "DATABASE_POOL_EXHAUSTED",
+                {"max_connections": self.max_connections}
+            ) from e
+        finally:
+            waiting.dec()
+        
+        try:
             yield connection
+        finally:
+            await self.pool.release(connection)
+    
+    def _current_pin(self) -> Optional[_PinnedConnection]:
+        """The connection pinned by the current task on this manager, if any"""
+        pinned = _pinned_connection.get()
+        if pinned is not None and pinned.manager is self and pinned.task is asyncio.current_task():
+            return pinned
+        return None
+    
+    @asynccontextmanager
+    async def pinned_connection(self, timeout: float = 10.0):
+        """
+        Hold one pool connection for a run of queries in the current task
+        
+        Inside the block, get_connection() and every query method reuse this
+        connection instead of acquiring per call, and prepared_fetch() keeps
+        its prepared statements. The connection goes back to the pool when the
+        block exits; tasks started inside the block use the pool as usual.
+        
+        Args:
+            timeout: Seconds to wait for a free connection before failing
+        """
+        pinned = self._current_pin()
+        if pinned is not None:
+            yield pinned.connection
+            return
+        
+        async with self.get_connection(timeout=timeout) as connection:
+            token = _pinned_connection.set(
+                _PinnedConnection(self, asyncio.current_task(), connection, {})
+            )
+            try:
+                yield connection
+            finally:
+                _pinned_connection.reset(token)
+    
+    async def prepared_fetch(self, key: str, sql: str, *args, timeout: float = 10.0) -> List[Dict[str, Any]]:
+        """
+        Run a repeated SELECT through a prepared statement
+        
+        Inside pinned_connection() the statement is prepared once per block
+        under `key` and re-executed directly. Outside one, each call takes a
+        pool connection (within `timeout`) and reuses that connection's cached
+        statement for `sql`.
+        
+        Args:
+            key: Stable identifier for the statement
+            sql: SQL query string
+            *args: Query parameters
+            timeout: Seconds to wait for a free connection before failing
+        
+        Returns:
+            List of dictionaries representing rows
+        """
+        pinned = self._current_pin()
+        try:
+            if pinned is None:
+                async with self.get_connection(timeout=timeout) as conn:
+                    rows = await conn.fetch(sql, *args)
+            else:
+                stmt = pinned.statements.get(key)
+                if stmt is None:
+                    stmt = pinned.statements[key] = await pinned.connection.prepare(sql)
+                rows = await stmt.fetch(*args)
+        except CashAppException:
+            raise
+        except Exception as e:
+            if logger.isEnabledFor(logging.ERROR):
+                logger.error("Prepared query execution failed", 
+                            extra={"statement": key, "error": str(e)})
+            raise CashAppException("Query failed", "DATABASE_QUERY_ERROR", cause=e) from e
+        return [dict(row) for row in rows]
     
-    async def execute_query(self, query: str, *args) -> List[Dict[str, Any]]:
+    async def execute_query(self, query: str, *args, cache_ttl: Optional[int] = None,
+                            cache_tables: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
         """
         Execute a SELECT query and return results
         
         Args:
             query: SQL query string
             *args: Query parameters
+            cache_ttl: Seconds to cache the result in Redis (no caching if None)
+            cache_tables: Extra tables the cached result depends on, for ones
+                not named after FROM/JOIN (comma joins, views, functions)
         
         Returns:
             List of dictionaries representing rows
         """
+        cache_key = None
+        if cache_ttl and self.redis is not None:
+            cache_key = self._make_cache_key(query, args)
+            try:
+                cached = await self.redis.get(cache_key)
+                if cached is not None:
+                    return json.loads(cached, object_hook=_decode_cached_value)
+            except Exception as e:
+                logger.warning("Query cache lookup failed", extra={"error": str(e)})
+        
         async with self.get_connection() as conn:
             try:
                 rows = await conn.fetch(query, *args)
-                return [dict(row) for row in rows]
+                result = [dict(row) for row in rows]
             except Exception as e:
-                logger.error("Query execution failed", 
-                            extra={"query": query, "error": str(e)})
-                raise CashAppException(f"Query failed: {e}", "DATABASE_QUERY_ERROR")
+                if logger.isEnabledFor(logging.ERROR):
+                    logger.error("Query execution failed", 
+                                extra={"query": query, "error": str(e)})
+                raise CashAppException("Query failed", "DATABASE_QUERY_ERROR", cause=e) from e
+        
+        if cache_key is not None:
+            await self._store_cached_result(cache_key, query, result, cache_ttl, cache_tables)
+        return result
+    
+    @staticmethod
+    def _make_cache_key(query: str, args: tuple) -> str:
+        """Build Redis key from query text and bind parameters"""
+        digest = hashlib.blake2b((query + repr(args)).encode(), digest_size=16).hexdigest()
+        return f"db_cache:{digest}"
+    
+    async def _store_cached_result(self, cache_key: str, query: str, result: List[Dict[str, Any]], cache_ttl: int,
+                                   cache_tables: Optional[Iterable[str]] = None):
+        """Store query result and index the key by table for invalidation"""
+        try:
+            payload = json.dumps(result, default=_encode_cached_value)
+        except (TypeError, ValueError) as e:
+            logger.debug("Query result not cacheable", extra={"error": str(e)})
+            return
+        tables = _referenced_tables(_READ_TABLES_RE, query)
+        tables.update(_normalize_table(table) for table in cache_tables or ())
+        try:
+            pipe = self.redis.pipeline()
+            pipe.setex(cache_key, cache_ttl, payload)
+            for table in tables:
+                tag = f"db_cache_table:{table}"
+                pipe.sadd(tag, cache_key)
+                pipe.expire(tag, cache_ttl)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("Query cache store failed", extra={"error": str(e)})
+    
+    async def _invalidate_cache(self, command: str):
+        """Drop cached results for every table modified by a write command"""
+        if self.redis is None:
+            return
+        tags = [f"db_cache_table:{table}" for table in _referenced_tables(_WRITE_TABLES_RE, command)]
+        if not tags:
+            return
+        try:
+            keys = await self.redis.sunion(*tags)
+            await self.redis.delete(*keys, *tags)
+        except Exception as e:
+            logger.warning("Query cache invalidation failed", extra={"error": str(e)})
     
     async def execute_command(self, command: str, *args) -> str:
         """
@@ -93,11 +370,14 @@ class DatabaseManager:
         async with self.get_connection() as conn:
             try:
                 result = await conn.execute(command, *args)
-                return result
             except Exception as e:
-                logger.error("Command execution failed", 
-                            extra={"command": command, "error": str(e)})
-                raise CashAppException(f"Command failed: {e}", "DATABASE_COMMAND_ERROR")
+                if logger.isEnabledFor(logging.ERROR):
+                    logger.error("Command execution failed", 
+                                extra={"command": command, "error": str(e)})
+                raise CashAppException("Command failed", "DATABASE_COMMAND_ERROR", cause=e) from e
+        
+        await self._invalidate_cache(command)
+        return result
     
     async def execute_transaction(self, commands: List[tuple]) -> bool:
         """
@@ -112,13 +392,45 @@ class DatabaseManager:
         async with self.get_connection() as conn:
             async with conn.transaction():
                 try:
-                    for command, *args in commands:
-                        await conn.execute(command, *args)
-                    return True
+                    # Consecutive runs of the same statement are sent as one batch
+                    for command, group in itertools.groupby(commands, key=lambda c: c[0]):
+                        records = [tuple(args) for _, *args in group]
+                        if len(records) == 1:
+                            await conn.execute(command, *records[0])
+                        elif len(records) > COPY_THRESHOLD and await self._copy_insert(conn, command, records):
+                            continue
+                        else:
+                            await conn.executemany(command, records)
                 except Exception as e:
-                    logger.error("Transaction failed", 
-                                extra={"commands_count": len(commands), "error": str(e)})
-                    raise CashAppException(f"Transaction failed: {e}", "DATABASE_TRANSACTION_ERROR")
+                    if logger.isEnabledFor(logging.ERROR):
+                        logger.error("Transaction failed", 
+                                    extra={"commands_count": len(commands), "error": str(e)})
+                    raise CashAppException("Transaction failed", "DATABASE_TRANSACTION_ERROR", cause=e) from e
+        
+        for command in {command for command, *_ in commands}:
+            await self._invalidate_cache(command)
+        return True
+    
+    @staticmethod
+    async def _copy_insert(conn, command: str, records: List[tuple]) -> bool:
+        """
+        Bulk load a plain INSERT through COPY
+        
+        Returns:
+            False if the statement isn't a simple positional INSERT
+        """
+        match = _COPYABLE_INSERT_RE.match(command)
+        if not match:
+            return False
+        
+        schema, table, columns, placeholders = match.groups()
+        columns = [c.strip() for c in columns.split(',')]
+        expected = ', '.join(f'${i}' for i in range(1, len(columns) + 1))
+        if ', '.join(p.strip() for p in placeholders.split(',')) != expected:
+            return False
+        
+        await conn.copy_records_to_table(table, records=records, columns=columns, schema_name=schema)
+        return True
 
 
 def get_database_url() -> str:
@@ -142,6 +454,39 @@ def get_database_url() -> str:
     return f"postgresql://{username}:{password}@{host}:{port}/{database}"
 
 
+def get_database_dsn_parts(connection_string: str = None) -> Dict[str, Any]:
+    """
+    Parse and validate a PostgreSQL connection URL into asyncpg connect kwargs
+    
+    Args:
+        connection_string: PostgreSQL URL, defaults to get_database_url()
+    
+    Returns:
+        Keyword arguments for asyncpg.connect / asyncpg.create_pool
+    """
+    url = connection_string or get_database_url()
+    parsed = urlparse(url)
+    if parsed.scheme not in ('postgres', 'postgresql'):
+        raise CashAppException(f"Unsupported database URL scheme: {parsed.scheme!r}", "DATABASE_CONFIG_ERROR")
+    
+    # Query options (sslmode, unix socket paths, ...) are left to asyncpg's own DSN parser
+    if parsed.query or not parsed.hostname:
+        return {'dsn': url}
+    
+    try:
+        port = parsed.port or 5432
+    except ValueError as e:
+        raise CashAppException("Invalid database port", "DATABASE_CONFIG_ERROR", cause=e) from e
+    
+    return {
+        'host': parsed.hostname,
+        'port': port,
+        'user': unquote(parsed.username) if parsed.username else None,
+        'password': unquote(parsed.password) if parsed.password else None,
+        'database': unquote(parsed.path.lstrip('/')) or None
+    }
+
+
 # Initialize global database manager
 db_manager = None
 
@@ -0,0 +1,47 @@
+# shared/db_pool.py
+"""
+Small shared asyncpg pools for lightweight probes
+Keeps one long-lived pool per DSN so health checks don't reconnect
+"""
+
+import asyncio
+import asyncpg
+from typing import Dict
+
+_pools: Dict[str, asyncpg.Pool] = {}
+_pools_lock = asyncio.Lock()
+
+
+async def get_pool(dsn: str) -> asyncpg.Pool:
+    """
+    Get (creating on first use) the probe pool for a DSN
+
+    Args:
+        dsn: PostgreSQL connection string
+
+    Returns:
+        Shared asyncpg pool
+    """
+    pool = _pools.get(dsn)
+    if pool is not None:
+        return pool
+
+    async with _pools_lock:
+        pool = _pools.get(dsn)
+        if pool is None:
+            pool = await asyncpg.create_pool(
+                dsn,
+                min_size=1,
+                max_size=4,
+                command_timeout=5,
+                server_settings={'tcp_keepalives_idle': '30'}
+            )
+            _pools[dsn] = pool
+    return pool
+
+
+async def close_pools():
+    """Close all probe pools; call on service shutdown"""
+    while _pools:
+        _, pool = _pools.popitem()
+        await pool.close()
@@ -6,12 +6,19 @@ Centralized error handling across all services
 
 class CashAppException(Exception):
     """Base exception for all CashApp errors"""
-    def __init__(self, message: str, error_code: str = None, details: dict = None):
+    def __init__(self, message: str, error_code: str = None, details: dict = None, cause: Exception = None):
         self.message = message
         self.error_code = error_code or "CASHAPP_ERROR"
         self.details = details or {}
+        # Underlying error is only formatted when the exception is rendered
+        self.cause = cause
         super().__init__(self.message)
 
+    def __str__(self):
+        if self.cause is None:
+            return self.message
+        return f"{self.message}: {self.cause}"
+
 
 class ValidationError(CashAppException):
     """Data validation errors"""
@@ -4,8 +4,10 @@ Health check utilities for CashAppAgent services
 Standardized health checking across all microservices
 """
 
+import os
 import time
 import asyncio
+import functools
 from typing import Dict, Any, List, Callable
 from datetime import datetime, timezone
 from dataclasses import dataclass
@@ -30,24 +32,63 @@ class HealthChecker:
     Provides standard health check functionality
     """
     
-    def __init__(self, service_name: str, version: str = "1.0.0"):
+    def __init__(self, service_name: str, version: str = "1.0.0", cache_ttl: float = 2.0):
         self.service_name = service_name
         self.version = version
         self.startup_time = time.time()
         self.health_checks = {}
+        # Recent response is reused for cache_ttl seconds to absorb probe polling
+        self.cache_ttl = cache_ttl
+        self._cached_response = None
+        self._cached_at = 0.0
+        self._refresh_lock = asyncio.Lock()
+        # Overall latency budget for dependency checks; laggards are reported as timeouts
+        self.sla_seconds = int(os.getenv('HEALTH_SLA_MS', '2000')) / 1000
     
-    def add_check(self, name: str, check_function: Callable):
-        """Add health check function"""
+    def add_check(self, name: str, check_function: Callable, blocking: bool = False):
+        """
+        Add health check function
+        
+        Args:
+            name: Check name in the health response
+            check_function: Callable returning an awaitable check result
+            blocking: True for a synchronous check; it is run in a worker thread
+        """
+        if blocking:
+            check_function = functools.partial(asyncio.to_thread, check_function)
         self.health_checks[name] = check_function
+        self._cached_response = None
         logger.info(f"Added health check: {name}")
     
     async def check_health(self) -> HealthResponse:
         """
         Run basic health check
         
+        Responses are cached for `cache_ttl` seconds; concurrent callers
+        arriving while a refresh is in flight wait for it instead of
+        re-running every dependency probe.
+        
         Returns:
             Basic health response
         """
+        if self._is_cache_fresh():
+            return self._cached_response
+        
+        async with self._refresh_lock:
+            if self._is_cache_fresh():
+                return self._cached_response
+            
+            response = await self._run_checks()
+            self._cached_response = response
+            self._cached_at = time.monotonic()
+            return response
+    
+    def _is_cache_fresh(self) -> bool:
+        return (self._cached_response is not None
+                and time.monotonic() - self._cached_at < self.cache_ttl)
+    
+    async def _run_checks(self) -> HealthResponse:
+        """Run all registered checks and build the health response"""
         start_time = time.time()
         
         try:
@@ -59,15 +100,24 @@ class HealthChecker:
                 'status': 'healthy'
             }
             
-            # Run additional checks if any
+            # Run additional checks concurrently, bounded by the SLA budget
             if self.health_checks:
-                for name, check_func in self.health_checks.items():
-                    try:
-                        result = await asyncio.wait_for(check_func(), timeout=10)
-                        checks[name] = result
-                    except Exception as e:
-                        checks[name] = {'status': 'failed', 'error': str(e)}
+                tasks = {
+                    name: asyncio.create_task(asyncio.wait_for(check_func(), timeout=10))
+                    for name, check_func in self.health_checks.items()
+                }
+                _, pending = await asyncio.wait(tasks.values(), timeout=self.sla_seconds)
+                
+                for name, task in tasks.items():
+                    if task in pending:
+                        task.cancel()
+                        checks[name] = {'status': 'timeout', 'error': f'No result within {self.sla_seconds}s'}
                         checks['status'] = 'degraded'
+                    elif task.exception() is not None:
+                        checks[name] = {'status': 'failed', 'error': str(task.exception())}
+                        checks['status'] = 'degraded'
+                    else:
+                        checks[name] = task.result()
             
             response_time = int((time.time() - start_time) * 1000)
             
@@ -97,14 +147,13 @@ class HealthChecker:
 async def check_database_connection(connection_string: str) -> Dict[str, Any]:
     """Check database connectivity"""
     try:
-        import asyncpg
-        
-        start_time = time.time()
-        conn = await asyncpg.connect(connection_string)
-        await conn.execute('SELECT 1')
-        await conn.close()
+        from .db_pool import get_pool
         
-        response_time = int((time.time() - start_time) * 1000)
+        pool = await get_pool(connection_string)
+        async with pool.acquire() as conn:
+            start_time = time.time()
+            await conn.fetchval('SELECT 1')
+            response_time = int((time.time() - start_time) * 1000)
         
         return {
             'status': 'healthy',
@@ -114,24 +163,46 @@ async def check_database_connection(connection_string: str) -> Dict[str, Any]:
     except Exception as e:
         return {
             'status': 'unhealthy',
-            'error': str(e)
+            'error': str(e),
+            'error_type': type(e).__name__
         }
 
+# Shared keep-alive client for HTTP probes
+_http_client = None
+
+def get_http_client():
+    """Get the shared httpx client used by HTTP health probes"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        import httpx
+        
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=200, keepalive_expiry=30.0),
+            timeout=httpx.Timeout(5.0)
+        )
+    return _http_client
+
+async def close_http_client():
+    """Close the shared HTTP probe client; call on service shutdown"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 async def check_http_service(url: str, timeout: int = 5) -> Dict[str, Any]:
     """Check HTTP service health"""
     try:
-        import httpx
+        client = get_http_client()
         
         start_time = time.time()
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, timeout=timeout)
-            response_time = int((time.time() - start_time) * 1000)
-            
-            return {
-                'status': 'healthy' if response.status_code == 200 else 'degraded',
-                'status_code': response.status_code,
-                'response_time_ms': response_time
-            }
+        response = await client.get(url, timeout=timeout)
+        response_time = int((time.time() - start_time) * 1000)
+        
+        return {
+            'status': 'healthy' if response.status_code == 200 else 'degraded',
+            'status_code': response.status_code,
+            'response_time_ms': response_time
+        }
             
     except Exception as e:
         return {
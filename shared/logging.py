@@ -4,17 +4,67 @@ Centralized logging configuration for CashAppAgent
 Structured logging with correlation IDs for tracing
 """
 
+import itertools
 import logging
 import json
 import sys
-from datetime import datetime
+from datetime import date, datetime, time, timezone
+from enum import Enum
 from typing import Any, Dict
 from contextvars import ContextVar
 import uuid
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
 # Context variable for correlation ID across async operations
 correlation_id: ContextVar[str] = ContextVar('correlation_id', default='')
 
+def _json_default(value: Any) -> Any:
+    """json.dumps fallback rendering values the way orjson does natively"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def dumps_log_entry(log_entry: Dict[str, Any]) -> str:
+    """Serialize a log entry to JSON, using orjson when it is installed"""
+    if orjson is not None:
+        # Non-string keys (ints, UUIDs, enums in extras) are stringified like json does
+        return orjson.dumps(log_entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(log_entry, default=_json_default, separators=(',', ':'), ensure_ascii=False)
+
+
+# Second-resolution ISO prefix, reused for every record within the same second
+_timestamp_cache = (None, '')
+
+
+def format_epoch_timestamp(seconds: float) -> str:
+    """Render a time.time() value as an ISO-8601 UTC string with millisecond precision"""
+    global _timestamp_cache
+    second = int(seconds)
+    cached_second, prefix = _timestamp_cache
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+        _timestamp_cache = (second, prefix)
+    return f"{prefix}.{int((seconds - second) * 1000):03d}Z"
+
+
+def format_record_timestamp(record: logging.LogRecord) -> str:
+    """Render record.created the same way as format_epoch_timestamp"""
+    return format_epoch_timestamp(record.created)
+
+
+# LogRecord.__init__ sets the same attributes in the same order on every record
+# and Logger.makeRecord adds `extra` right after them, so a record's extras are
+# the attributes from this offset on, up to what formatting itself adds later
+_EXTRA_OFFSET = len(logging.LogRecord('', logging.INFO, '', 0, '', (), None).__dict__)
+_FORMATTER_ATTRS = frozenset({'message', 'asctime', 'correlation_id'})
+
 
 class StructuredFormatter(logging.Formatter):
     """
@@ -24,31 +74,33 @@ class StructuredFormatter(logging.Formatter):
     
     def format(self, record):
         log_entry = {
-            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'timestamp': format_record_timestamp(record),
             'level': record.levelname,
             'logger': record.name,
             'message': record.getMessage(),
             'module': record.module,
             'function': record.funcName,
             'line': record.lineno,
-            'correlation_id': correlation_id.get() or str(uuid.uuid4()),
             'service': getattr(record, 'service', 'cashapp-agent'),
         }
         
+        # Only tag records that belong to a traced request; an explicit
+        # extra={'correlation_id': ...} wins over the context's ID
+        record_fields = record.__dict__
+        corr_id = record_fields.get('correlation_id') or correlation_id.get()
+        if corr_id:
+            log_entry['correlation_id'] = corr_id
+        
         # Add exception info if present
         if record.exc_info:
             log_entry['exception'] = self.formatException(record.exc_info)
             
         # Add extra fields from record
-        for key, value in record.__dict__.items():
-            if key not in ['name', 'msg', 'args', 'levelname', 'levelno', 
-                          'pathname', 'filename', 'module', 'lineno', 
-                          'funcName', 'created', 'msecs', 'relativeCreated',
-                          'thread', 'threadName', 'processName', 'process',
-                          'getMessage', 'exc_info', 'exc_text', 'stack_info']:
+        for key, value in itertools.islice(record_fields.items(), _EXTRA_OFFSET, None):
+            if key not in _FORMATTER_ATTRS:
                 log_entry[key] = value
                 
-        return json.dumps(log_entry)
+        return dumps_log_entry(log_entry)
 
 
 def setup_logging(service_name: str, log_level: str = "INFO") -> logging.Logger:
@@ -5,18 +5,17 @@ Provides structured logging with correlation IDs and monitoring integration
 """
 
 import os
-import json
 import time
 import uuid
 from typing import Dict, Any, Optional
-from datetime import datetime, timezone
 import logging
 import logging.config
 from contextlib import asynccontextmanager
 from fastapi import Request
 
-# Global correlation ID storage
-_correlation_context = {}
+# One correlation ID per request/task, shared with shared.logging's formatter
+from .logging import correlation_id as _correlation_id
+from .logging import dumps_log_entry, format_record_timestamp
 
 
 class JSONFormatter(logging.Formatter):
@@ -25,7 +24,7 @@ class JSONFormatter(logging.Formatter):
     def format(self, record):
         """Format log record as JSON"""
         log_entry = {
-            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'timestamp': format_record_timestamp(record),
             'level': record.levelname,
             'logger': record.name,
             'message': record.getMessage(),
@@ -47,7 +46,7 @@ class JSONFormatter(logging.Formatter):
         if record.exc_info:
             log_entry['exception'] = self.formatException(record.exc_info)
 
-        return json.dumps(log_entry)
+        return dumps_log_entry(log_entry)
 
 def setup_logging_config():
     """Setup centralized logging configuration"""
@@ -128,11 +127,7 @@ def set_correlation_id(correlation_id: str = None) -> str:
     if not correlation_id:
         correlation_id = str(uuid.uuid4())
     
-    # Store in thread-local storage equivalent
-    import threading
-    current_thread = threading.current_thread()
-    thread_id = current_thread.ident
-    _correlation_context[thread_id] = correlation_id
+    _correlation_id.set(correlation_id)
     
     return correlation_id
 
@@ -143,17 +138,11 @@ def get_correlation_id() -> Optional[str]:
     Returns:
         Current correlation ID or None
     """
-    import threading
-    current_thread = threading.current_thread()
-    thread_id = current_thread.ident
-    return _correlation_context.get(thread_id)
+    return _correlation_id.get() or None
 
 def clear_correlation_id():
-    """Clear correlation ID for current thread"""
-    import threading
-    current_thread = threading.current_thread()
-    thread_id = current_thread.ident
-    _correlation_context.pop(thread_id, None)
+    """Clear correlation ID for current request"""
+    _correlation_id.set('')
 
 async def correlation_id_middleware(request: Request, call_next):
     """
@@ -170,7 +159,7 @@ async def correlation_id_middleware(request: Request, call_next):
     correlation_id = request.headers.get('X-Correlation-ID') or str(uuid.uuid4())
     
     # Set correlation ID
-    set_correlation_id(correlation_id)
+    token = _correlation_id.set(correlation_id)
     
     try:
         # Process request
@@ -182,8 +171,8 @@ async def correlation_id_middleware(request: Request, call_next):
         return response
         
     finally:
-        # Clean up correlation ID
-        clear_correlation_id()
+        # Restore the previous correlation ID
+        _correlation_id.reset(token)
 
 # Initialize logging on module import
 setup_logging_config()
@@ -5,14 +5,49 @@ Prometheus metrics utilities for CashAppAgent
 Standardized metrics collection across all services
 """
 
-from prometheus_client import Counter, Histogram, Gauge, Info
+from prometheus_client import (
+    Counter, Histogram, Gauge, Info, REGISTRY, CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest
+)
+from prometheus_client import multiprocess
+import os
 import time
 import asyncio
-from functools import wraps
-from typing import Dict, Any
+from collections import deque, defaultdict
+from functools import wraps, lru_cache
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from .logging import get_correlation_id
 
 
+# Under multi-worker servers (gunicorn) metric values live in mmap files in this
+# directory; prometheus_client switches its value storage when the variable is set
+MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+
+def get_exposition_registry():
+    """Registry to expose on /metrics, aggregating all workers in multiprocess mode"""
+    if not MULTIPROC_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_endpoint() -> bytes:
+    """Encode the current metrics in Prometheus text format"""
+    return generate_latest(get_exposition_registry())
+
+
+# Request observations queued by MetricsCollector.record_request; past this
+# many unapplied observations the oldest are dropped
+REQUEST_QUEUE_SIZE = int(os.environ.get('METRICS_REQUEST_QUEUE_SIZE', '10000'))
+REQUEST_DRAIN_BATCH = 256
+
+
+# Shared histogram bucket layouts; reuse these tuples instead of per-metric lists
+BUCKETS_PROCESSING_SECONDS = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
+BUCKETS_RATIO = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+
 # Common metrics for all services
 REQUEST_COUNT = Counter(
     'cashapp_requests_total',
@@ -71,43 +106,56 @@ def track_request_metrics(service_name: str):
         service_name: Name of the service
     """
     def decorator(func):
-        @wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            start_time = time.time()
-            endpoint = func.__name__
-            method = "POST"  # Assuming POST for most API calls
-            status = "success"
+        # Resolved once per decorated function instead of on every call
+        endpoint = func.__name__
+        method = "POST"  # Assuming POST for most API calls
+        perf_counter_ns = time.perf_counter_ns
+        request_count = {
+            status: REQUEST_COUNT.labels(
+                service=service_name,
+                endpoint=endpoint,
+                method=method,
+                status=status
+            )
+            for status in ("success", "error")
+        }
+        request_duration = REQUEST_DURATION.labels(
+            service=service_name,
+            endpoint=endpoint,
+            method=method
+        )
+        
+        def record_error(e: Exception):
+            ERROR_COUNT.labels(
+                service=service_name,
+                error_type=e.__class__.__name__,
+                error_code=getattr(e, 'error_code', 'UNKNOWN')
+            ).inc()
+        
+        # Only the wrapper matching the function kind is built
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start_ns = perf_counter_ns()
+                status = "success"
+                
+                try:
+                    result = await func(*args, **kwargs)
+                    return result
+                except Exception as e:
+                    status = "error"
+                    record_error(e)
+                    raise
+                finally:
+                    duration = (perf_counter_ns() - start_ns) * 1e-9
+                    request_count[status].inc()
+                    request_duration.observe(duration)
             
-            try:
-                result = await func(*args, **kwargs)
-                return result
-            except Exception as e:
-                status = "error"
-                ERROR_COUNT.labels(
-                    service=service_name,
-                    error_type=type(e).__name__,
-                    error_code=getattr(e, 'error_code', 'UNKNOWN')
-                ).inc()
-                raise
-            finally:
-                duration = time.time() - start_time
-                REQUEST_COUNT.labels(
-                    service=service_name,
-                    endpoint=endpoint,
-                    method=method,
-                    status=status
-                ).inc()
-                REQUEST_DURATION.labels(
-                    service=service_name,
-                    endpoint=endpoint,
-                    method=method
-                ).observe(duration)
+            return async_wrapper
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            start_time = time.time()
-            endpoint = func.__name__
-            method = "POST"
+            start_ns = perf_counter_ns()
             status = "success"
             
             try:
@@ -115,27 +163,14 @@ def track_request_metrics(service_name: str):
                 return result
             except Exception as e:
                 status = "error"
-                ERROR_COUNT.labels(
-                    service=service_name,
-                    error_type=type(e).__name__,
-                    error_code=getattr(e, 'error_code', 'UNKNOWN')
-                ).inc()
+                record_error(e)
                 raise
             finally:
-                duration = time.time() - start_time
-                REQUEST_COUNT.labels(
-                    service=service_name,
-                    endpoint=endpoint,
-                    method=method,
-                    status=status
-                ).inc()
-                REQUEST_DURATION.labels(
-                    service=service_name,
-                    endpoint=endpoint,
-                    method=method
-                ).observe(duration)
+                duration = (perf_counter_ns() - start_ns) * 1e-9
+                request_count[status].inc()
+                request_duration.observe(duration)
         
-        return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+        return sync_wrapper
     return decorator
 
 
@@ -163,6 +198,35 @@ def track_business_metrics(transaction_status: str, processing_time: float,
     ).observe(processing_time)
 
 
+def track_business_metrics_batch(service_name: str, events: List[Tuple[str, float, Optional[str]]]):
+    """
+    Track business metrics for a batch of processed transactions
+    
+    Counter updates are grouped per label combination so each distinct
+    (status, discrepancy_type) pair is labeled and incremented once.
+    
+    Args:
+        service_name: Name of the processing service
+        events: (transaction_status, processing_time, discrepancy_type) tuples
+    """
+    counts = defaultdict(int)
+    processing_time = PROCESSING_TIME.labels(
+        service=service_name,
+        transaction_type="payment_matching"
+    )
+    
+    for transaction_status, duration, discrepancy_type in events:
+        counts[(transaction_status, discrepancy_type or "none")] += 1
+        processing_time.observe(duration)
+    
+    for (transaction_status, discrepancy_type), count in counts.items():
+        TRANSACTIONS_PROCESSED.labels(
+            service=service_name,
+            status=transaction_status,
+            discrepancy_type=discrepancy_type
+        ).inc(count)
+
+
 class MetricsCollector:
     """
     Centralized metrics collection for services
@@ -170,32 +234,189 @@ class MetricsCollector:
     
     def __init__(self, service_name: str):
         self.service_name = service_name
-        
-    def increment_request_count(self, endpoint: str, method: str = "POST", status: str = "success"):
-        """Increment request counter"""
-        REQUEST_COUNT.labels(
+        # Labeled children are resolved once per label combination
+        self._request_count_child = lru_cache(maxsize=4096)(self._bind_request_count)
+        self._request_duration_child = lru_cache(maxsize=4096)(self._bind_request_duration)
+        self._error_count_child = lru_cache(maxsize=1024)(self._bind_error_count)
+        # Request observations queued off the request path; applied by the
+        # drain task between start() and aclose(), inline otherwise
+        self._pending = deque(maxlen=REQUEST_QUEUE_SIZE)
+        self._pending_ready = None
+        self._drain_task = None
+    
+    def _bind_request_count(self, endpoint: str, method: str, status: str):
+        return REQUEST_COUNT.labels(
             service=self.service_name,
             endpoint=endpoint,
             method=method,
             status=status
-        ).inc()
-        
-    def record_request_duration(self, endpoint: str, duration: float, method: str = "POST"):
-        """Record request duration"""
-        REQUEST_DURATION.labels(
+        )
+    
+    def _bind_request_duration(self, endpoint: str, method: str):
+        return REQUEST_DURATION.labels(
             service=self.service_name,
             endpoint=endpoint,
             method=method
-        ).observe(duration)
-        
-    def increment_error_count(self, error_type: str, error_code: str = "UNKNOWN"):
-        """Increment error counter"""
-        ERROR_COUNT.labels(
+        )
+    
+    def _bind_error_count(self, error_type: str, error_code: str):
+        return ERROR_COUNT.labels(
             service=self.service_name,
             error_type=error_type,
             error_code=error_code
-        ).inc()
+        )
+        
+    def increment_request_count(self, endpoint: str, method: str = "POST", status: str = "success"):
+        """Increment request counter"""
+        self._request_count_child(endpoint, method, status).inc()
+        
+    def record_request_duration(self, endpoint: str, duration: float, method: str = "POST"):
+        """Record request duration"""
+        self._request_duration_child(endpoint, method).observe(duration)
+        
+    def record_request(self, endpoint: str, duration: float, method: str = "POST", status: str = "success"):
+        """
+        Record a request count + duration observation
+        
+        While the drain task runs the observation is only queued; otherwise
+        it is applied immediately.
+        """
+        if self._drain_task is None or self._drain_task.done():
+            self._request_count_child(endpoint, method, status).inc()
+            self._request_duration_child(endpoint, method).observe(duration)
+            return
+        self._pending.append((endpoint, method, status, duration))
+        self._pending_ready.set()
+    
+    def flush_pending(self, batch_size: int = REQUEST_DRAIN_BATCH) -> int:
+        """Apply up to `batch_size` queued request observations"""
+        pending = self._pending
+        applied = 0
+        while pending and applied < batch_size:
+            endpoint, method, status, duration = pending.popleft()
+            self._request_count_child(endpoint, method, status).inc()
+            self._request_duration_child(endpoint, method).observe(duration)
+            applied += 1
+        return applied
+    
+    def start(self):
+        """Start the task applying queued request observations; call from the service lifespan"""
+        if self._drain_task is None or self._drain_task.done():
+            self._pending_ready = asyncio.Event()
+            self._drain_task = asyncio.get_running_loop().create_task(self._drain_pending())
+    
+    async def aclose(self):
+        """Stop the drain task and apply the observations still queued"""
+        task, self._drain_task = self._drain_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        while self.flush_pending():
+            pass
+    
+    async def _drain_pending(self):
+        """Apply queued observations in batches, sleeping while the queue is empty"""
+        ready = self._pending_ready
+        while True:
+            await ready.wait()
+            ready.clear()
+            while self.flush_pending():
+                # Let request handlers run between batches
+                await asyncio.sleep(0)
+        
+    def increment_error_count(self, error_type: str, error_code: str = "UNKNOWN"):
+        """Increment error counter"""
+        self._error_count_child(error_type, error_code).inc()
         
     def track_transaction(self, status: str, processing_time: float, discrepancy_type: str = None):
         """Track business transaction metrics"""
-        track_business_metrics(status, processing_time, self.service_name, discrepancy_type)
\ No newline at end of file
+        track_business_metrics(status, processing_time, self.service_name, discrepancy_type)
+    
+    def get_metrics_app(self, cache_seconds: float = 1.0):
+        """
+        ASGI app serving the Prometheus registry
+        
+        The encoded exposition is reused for `cache_seconds`, so concurrent
+        scrapers and federators don't each re-serialize every series.
+        
+        Args:
+            cache_seconds: How long an encoded scrape body stays valid
+        """
+        return make_cached_metrics_app(get_exposition_registry(), cache_seconds)
+
+
+def metrics_middleware(get_collector: Callable[[], Optional[MetricsCollector]]):
+    """
+    Build an HTTP middleware recording every request through record_request
+    
+    Requests are labeled with their route template rather than the raw path,
+    so path parameters don't create a series per value.
+    
+    Args:
+        get_collector: Returns the service's collector, or None before startup
+    """
+    async def record_request_metrics(request, call_next):
+        start = time.perf_counter()
+        status = "error"
+        try:
+            response = await call_next(request)
+            if response.status_code < 400:
+                status = "success"
+            return response
+        finally:
+            collector = get_collector()
+            if collector is not None:
+                route = request.scope.get('route')
+                collector.record_request(
+                    getattr(route, 'path', 'unmatched'),
+                    time.perf_counter() - start,
+                    request.method,
+                    status
+                )
+    
+    return record_request_metrics
+
+
+def make_cached_metrics_app(registry=None, cache_seconds: float = 1.0):
+    """
+    Build an ASGI app that serves `generate_latest(registry)` with a short cache
+    
+    Only HTTP requests are answered; lifespan events are acknowledged and
+    websocket connections are closed.
+    
+    Args:
+        registry: Prometheus collector registry to expose
+        cache_seconds: How long an encoded scrape body stays valid
+    """
+    registry = registry or get_exposition_registry()
+    cached_body = b''
+    cached_at = float('-inf')
+    headers = [(b'content-type', CONTENT_TYPE_LATEST.encode('latin-1'))]
+    
+    async def metrics_app(scope, receive, send):
+        nonlocal cached_body, cached_at
+        if scope['type'] == 'lifespan':
+            # Nothing to set up; acknowledge so the app can also run standalone
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        if scope['type'] != 'http':
+            if scope['type'] == 'websocket':
+                # Closing before accepting rejects the handshake
+                await receive()
+                await send({'type': 'websocket.close', 'code': 1000})
+            return
+        
+        now = time.perf_counter()
+        if now - cached_at >= cache_seconds:
+            cached_body = generate_latest(registry)
+            cached_at = now
+        
+        await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': cached_body})
+    
+    return metrics_app
\ No newline at end of file
@@ -4,13 +4,31 @@ Core Pydantic models for CashAppAgent
 These models define the data structures used across all services
 """
 
-from typing import List, Dict, Optional
+import sys
+import time
+from typing import Annotated, Any, Dict, List, Literal, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, StringConstraints, TypeAdapter
 from enum import Enum
 
 
+# Monetary amount matching the DECIMAL(15,2) columns, enforced by pydantic-core
+Money = Annotated[Decimal, Field(max_digits=15, decimal_places=2)]
+
+# ISO 4217 code, upper-cased by pydantic-core and interned so rows share one string
+Currency = Annotated[str, StringConstraints(min_length=3, max_length=3, to_upper=True), AfterValidator(sys.intern)]
+
+# Bound once so default factories skip the attribute lookup per instance
+_utcnow = datetime.utcnow
+
+# Model configs shared by every class below instead of one ConfigDict each;
+# cold path models build their validator on first use, not at import
+_MODEL_CONFIG = ConfigDict(use_enum_values=True)
+_FROZEN_MODEL_CONFIG = ConfigDict(use_enum_values=True, frozen=True)
+_COLD_MODEL_CONFIG = ConfigDict(use_enum_values=True, defer_build=True)
+
+
 class TransactionStatus(str, Enum):
     """Transaction processing status"""
     PENDING = "pending"
@@ -39,37 +57,30 @@ class DiscrepancyCode(str, Enum):
     DUPLICATE_PAYMENT = "duplicate_payment"
 
 
+# Status groups for membership tests; str-valued members hash like their
+# wire values, so these also match the plain strings stored by use_enum_values
+APPLIED_TRANSACTION_STATUSES = frozenset({TransactionStatus.MATCHED, TransactionStatus.PARTIALLY_MATCHED})
+PAYABLE_INVOICE_STATUSES = frozenset({InvoiceStatus.OPEN, InvoiceStatus.OVERDUE})
+
+
 class PaymentTransaction(BaseModel):
     """
     Payment transaction from bank feed
     Core data structure for incoming payments
     """
     transaction_id: str = Field(..., description="Unique ID from bank feed")
+    amount: Money = Field(..., description="Payment amount", gt=0)
+    currency: Currency = Field(..., description="ISO 4217 currency code")
+    customer_identifier: Optional[str] = Field(None, description="Identified customer from remittance data")
     source_account_ref: str = Field(..., description="Source bank account reference")
-    amount: Decimal = Field(..., description="Payment amount", gt=0)
-    currency: str = Field(..., description="ISO 4217 currency code", min_length=3, max_length=3)
     value_date: datetime = Field(..., description="Value date of the payment")
-    raw_remittance_data: Optional[str] = Field(None, description="Text from bank feed")
-    associated_document_uris: Optional[List[str]] = Field(None, description="URIs to PDFs/emails in Azure Blob Storage")
-    customer_identifier: Optional[str] = Field(None, description="Identified customer from remittance data")
     processing_status: TransactionStatus = Field(TransactionStatus.PENDING, description="Current processing status")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-
-    @validator('currency')
-    def validate_currency(cls, v):
-        """Ensure currency is uppercase ISO 4217 code"""
-        return v.upper()
-
-    @validator('amount')
-    def validate_amount_precision(cls, v):
-        """Ensure amount has max 2 decimal places for financial accuracy"""
-        if v.as_tuple().exponent < -2:
-            raise ValueError('Amount cannot have more than 2 decimal places')
-        return v
+    raw_remittance_data: Optional[str] = Field(None, description="Text from bank feed")
+    associated_document_uris: Optional[Tuple[str, ...]] = Field((), description="URIs to PDFs/emails in Azure Blob Storage")
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
 
-    class Config:
-        use_enum_values = True
+    model_config = _MODEL_CONFIG
 
 
 class Invoice(BaseModel):
@@ -78,27 +89,16 @@ class Invoice(BaseModel):
     Represents an open or closed invoice
     """
     invoice_id: str = Field(..., description="Invoice ID from ERP system")
+    amount_due: Money = Field(..., description="Outstanding amount", ge=0)
+    currency: Currency = Field(..., description="ISO 4217 currency code")
     customer_id: str = Field(..., description="Customer identifier")
     customer_name: Optional[str] = Field(None, description="Customer display name")
-    amount_due: Decimal = Field(..., description="Outstanding amount", ge=0)
-    original_amount: Decimal = Field(..., description="Original invoice amount", gt=0)
-    currency: str = Field(..., description="ISO 4217 currency code", min_length=3, max_length=3)
+    original_amount: Money = Field(..., description="Original invoice amount", gt=0)
     status: InvoiceStatus = Field(..., description="Current invoice status")
     due_date: Optional[datetime] = Field(None, description="Payment due date")
     created_date: datetime = Field(..., description="Invoice creation date")
-    
-    @validator('currency')
-    def validate_currency(cls, v):
-        return v.upper()
-
-    @validator('amount_due', 'original_amount')
-    def validate_amount_precision(cls, v):
-        if v.as_tuple().exponent < -2:
-            raise ValueError('Amount cannot have more than 2 decimal places')
-        return v
 
-    class Config:
-        use_enum_values = True
+    model_config = _FROZEN_MODEL_CONFIG
 
 
 class MatchResult(BaseModel):
@@ -108,31 +108,26 @@ class MatchResult(BaseModel):
     """
     transaction_id: str = Field(..., description="Reference to original transaction")
     status: TransactionStatus = Field(..., description="Matching result status")
-    matched_pairs: Dict[str, Decimal] = Field(default_factory=dict, description="Invoice ID -> Amount applied")
-    unapplied_amount: Decimal = Field(Decimal('0'), description="Remaining unallocated amount", ge=0)
+    unapplied_amount: Money = Field(Decimal('0'), description="Remaining unallocated amount", ge=0)
+    confidence_score: Optional[float] = Field(None, description="ML confidence score (0-1)", ge=0, le=1)
+    matched_pairs: Dict[str, Money] = Field(default_factory=dict, description="Invoice ID -> Amount applied")
     discrepancy_code: Optional[DiscrepancyCode] = Field(None, description="Type of discrepancy if any")
     log_entry: str = Field(..., description="Human-readable summary of actions taken")
-    confidence_score: Optional[float] = Field(None, description="ML confidence score (0-1)", ge=0, le=1)
     processing_time_ms: Optional[int] = Field(None, description="Processing time in milliseconds", ge=0)
     requires_human_review: bool = Field(False, description="Flag for human intervention needed")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
 
-    @validator('unapplied_amount')
-    def validate_unapplied_precision(cls, v):
-        if v.as_tuple().exponent < -2:
-            raise ValueError('Unapplied amount cannot have more than 2 decimal places')
-        return v
+    model_config = _FROZEN_MODEL_CONFIG
 
-    @validator('matched_pairs')
-    def validate_matched_pairs_precision(cls, v):
-        """Ensure all matched amounts have proper precision"""
-        for invoice_id, amount in v.items():
-            if amount.as_tuple().exponent < -2:
-                raise ValueError(f'Matched amount for {invoice_id} cannot have more than 2 decimal places')
-        return v
+    @property
+    def matched_invoice_ids(self) -> tuple:
+        """Invoice IDs in matched_pairs"""
+        return tuple(self.matched_pairs)
 
-    class Config:
-        use_enum_values = True
+    @property
+    def total_applied(self) -> Decimal:
+        """Sum of matched_pairs amounts"""
+        return sum(self.matched_pairs.values(), Decimal('0'))
 
 
 class DocumentParsingResult(BaseModel):
@@ -141,16 +136,15 @@ class DocumentParsingResult(BaseModel):
     Output of DIM document parsing
     """
     document_uri: str = Field(..., description="URI of processed document")
-    invoice_ids: List[str] = Field(default_factory=list, description="Extracted invoice IDs")
+    invoice_ids: Tuple[str, ...] = Field((), description="Extracted invoice IDs")
     confidence_score: float = Field(..., description="Overall extraction confidence", ge=0, le=1)
-    extracted_amounts: Optional[List[Decimal]] = Field(None, description="Extracted monetary amounts")
-    customer_identifiers: Optional[List[str]] = Field(None, description="Extracted customer references")
+    extracted_amounts: Optional[Tuple[Decimal, ...]] = Field((), description="Extracted monetary amounts")
+    customer_identifiers: Optional[Tuple[str, ...]] = Field((), description="Extracted customer references")
     processing_time_ms: int = Field(..., description="Processing time in milliseconds", ge=0)
     ocr_text: Optional[str] = Field(None, description="Full OCR extracted text")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
 
-    class Config:
-        use_enum_values = True
+    model_config = _COLD_MODEL_CONFIG
 
 
 class ERPOperationResult(BaseModel):
@@ -163,11 +157,10 @@ class ERPOperationResult(BaseModel):
     erp_transaction_id: Optional[str] = Field(None, description="ERP system transaction ID")
     success: bool = Field(..., description="Operation success flag")
     error_message: Optional[str] = Field(None, description="Error details if failed")
-    affected_invoices: List[str] = Field(default_factory=list, description="List of affected invoice IDs")
-    operation_timestamp: datetime = Field(default_factory=datetime.utcnow)
+    affected_invoices: Tuple[str, ...] = Field((), description="List of affected invoice IDs")
+    operation_timestamp: datetime = Field(default_factory=_utcnow)
 
-    class Config:
-        use_enum_values = True
+    model_config = _COLD_MODEL_CONFIG
 
 
 class CommunicationRequest(BaseModel):
@@ -175,15 +168,14 @@ class CommunicationRequest(BaseModel):
     Request for Communication Module
     Input for CM email/message operations
     """
-    request_type: str = Field(..., description="Type of communication (email, slack, teams)")
+    request_type: Literal["email", "slack", "teams"] = Field(..., description="Type of communication")
     recipient: str = Field(..., description="Recipient identifier")
     template_name: str = Field(..., description="Message template to use")
-    template_data: Dict = Field(default_factory=dict, description="Data for template rendering")
-    priority: str = Field("normal", description="Message priority (low, normal, high, urgent)")
+    template_data: Dict[str, Any] = Field(default_factory=dict, description="Data for template rendering")
+    priority: Literal["low", "normal", "high", "urgent"] = Field("normal", description="Message priority")
     transaction_id: Optional[str] = Field(None, description="Related transaction ID")
     
-    class Config:
-        use_enum_values = True
+    model_config = _COLD_MODEL_CONFIG
 
 
 class HealthResponse(BaseModel):
@@ -193,8 +185,15 @@ class HealthResponse(BaseModel):
     """
     status: str = Field(..., description="Service health status")
     service: str = Field(..., description="Service name")
-    timestamp: float = Field(..., description="Unix timestamp")
+    timestamp: float = Field(default_factory=time.time, description="Unix timestamp")
     details: Optional[Dict] = Field(None, description="Additional health details")
     
-    class Config:
-        use_enum_values = True
\ No newline at end of file
+    model_config = _COLD_MODEL_CONFIG
+
+
+# Bulk validators: validate a whole batch in one pydantic-core call, e.g.
+# InvoiceListAdapter.validate_python(rows) or .validate_json(raw_bytes),
+# instead of constructing models one row at a time
+PaymentTransactionListAdapter = TypeAdapter(List[PaymentTransaction])
+InvoiceListAdapter = TypeAdapter(List[Invoice])
+MatchResultListAdapter = TypeAdapter(List[MatchResult])
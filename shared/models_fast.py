@@ -0,0 +1,108 @@
+# shared/models_fast.py
+"""
+msgspec mirrors of the hot-path shared models
+Used to decode large bank-feed and ERP batches; convert to the Pydantic
+models in shared.models only where a caller needs their full validation
+Requires msgspec, which unlike orjson has no fallback: a service importing
+this module must list it in its own requirements.txt
+"""
+
+from typing import Annotated, Dict, List, Optional, Tuple
+from decimal import Decimal
+from datetime import datetime
+
+import msgspec
+
+from .models import (
+    PaymentTransaction, Invoice, MatchResult, TransactionStatus,
+    PaymentTransactionListAdapter, InvoiceListAdapter, MatchResultListAdapter
+)
+
+# Structural checks only; amount bounds, precision and upper-casing are
+# applied by the Pydantic models on conversion (msgspec has no Decimal bounds)
+CurrencyCode = Annotated[str, msgspec.Meta(min_length=3, max_length=3)]
+
+# Record timestamps left unset on the wire get the Pydantic model's default
+_DEFAULTED_TIMESTAMPS = ('created_at', 'updated_at')
+
+
+def _as_model_input(row: msgspec.Struct) -> dict:
+    """Struct fields as a dict for Pydantic validation, minus unset timestamps"""
+    data = msgspec.structs.asdict(row)
+    for key in _DEFAULTED_TIMESTAMPS:
+        if key in data and data[key] is None:
+            del data[key]
+    return data
+
+
+# gc=False: these structs only hold strings, numbers, dates and flat
+# containers of them, so they can never be part of a reference cycle
+class PaymentTransactionFast(msgspec.Struct, frozen=True, gc=False):
+    """Bank-feed payment row, see shared.models.PaymentTransaction"""
+    transaction_id: str
+    source_account_ref: str
+    amount: Decimal
+    currency: CurrencyCode
+    value_date: datetime
+    raw_remittance_data: Optional[str] = None
+    associated_document_uris: Optional[Tuple[str, ...]] = ()
+    customer_identifier: Optional[str] = None
+    processing_status: str = TransactionStatus.PENDING.value
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    def to_model(self) -> PaymentTransaction:
+        return PaymentTransaction.model_validate(_as_model_input(self))
+
+
+class InvoiceFast(msgspec.Struct, frozen=True, gc=False):
+    """ERP invoice row, see shared.models.Invoice"""
+    invoice_id: str
+    customer_id: str
+    amount_due: Decimal
+    original_amount: Decimal
+    currency: CurrencyCode
+    status: str
+    created_date: datetime
+    customer_name: Optional[str] = None
+    due_date: Optional[datetime] = None
+
+    def to_model(self) -> Invoice:
+        return Invoice.model_validate(_as_model_input(self))
+
+
+class MatchResultFast(msgspec.Struct, frozen=True, gc=False):
+    """Matching outcome, see shared.models.MatchResult"""
+    transaction_id: str
+    status: str
+    log_entry: str
+    matched_pairs: Dict[str, Decimal] = {}
+    unapplied_amount: Decimal = Decimal('0')
+    discrepancy_code: Optional[str] = None
+    confidence_score: Optional[float] = None
+    processing_time_ms: Optional[int] = None
+    requires_human_review: bool = False
+    created_at: Optional[datetime] = None
+
+    def to_model(self) -> MatchResult:
+        return MatchResult.model_validate(_as_model_input(self))
+
+
+payment_transactions_decoder = msgspec.json.Decoder(List[PaymentTransactionFast])
+invoices_decoder = msgspec.json.Decoder(List[InvoiceFast])
+match_results_decoder = msgspec.json.Decoder(List[MatchResultFast])
+
+
+def to_payment_transactions(rows: List[PaymentTransactionFast]) -> List[PaymentTransaction]:
+    """Convert a decoded batch to Pydantic models in one validation call"""
+    return PaymentTransactionListAdapter.validate_python([_as_model_input(r) for r in rows])
+
+
+def to_invoices(rows: List[InvoiceFast]) -> List[Invoice]:
+    """Convert a decoded batch to Pydantic models in one validation call"""
+    return InvoiceListAdapter.validate_python([_as_model_input(r) for r in rows])
+
+
+def to_match_results(rows: List[MatchResultFast]) -> List[MatchResult]:
+    """Convert a decoded batch to Pydantic models in one validation call"""
+    return MatchResultListAdapter.validate_python([_as_model_input(r) for r in rows])
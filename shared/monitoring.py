@@ -5,82 +5,331 @@ Integrates Application Insights, custom metrics, and health checks
 """
 
 import os
+import gzip
+import itertools
+import math
+import random
+import threading
 import time
 import traceback
-from typing import Dict, Any, List, Optional, Callable
+import zlib
+from collections import OrderedDict, deque
+from functools import lru_cache, partial
+from operator import itemgetter
+from typing import TYPE_CHECKING, Dict, Any, List, NamedTuple, Optional, Callable, Union
 from datetime import datetime, timezone
 from dataclasses import dataclass
 from enum import Enum
 import asyncio
+import bisect
+import json
+import numpy as np
 import psutil
 
-from .logging import setup_logging
-from .exception import CashAppException
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+from .logging import setup_logging, format_epoch_timestamp, dumps_log_entry
+from .exceptions import CashAppException
+
+if TYPE_CHECKING:
+    from .database import DatabaseManager
 
 logger = setup_logging("monitoring")
 
-# Application Insights integration (placeholder - would use actual SDK)
+# Number of client_id buckets used as a histogram label
+CLIENT_BUCKETS = 64
+
+_MIB = 1 << 20
+_GIB = 1 << 30
+
+# Disk usage barely moves between health runs; re-read it at most this often
+DISK_USAGE_INTERVAL_SECONDS = 30
+
+# System CPU is sampled in the background at this cadence instead of per request
+CPU_SAMPLE_INTERVAL_SECONDS = 5
+
+# Back-to-back health runs reuse one system snapshot for this long
+SYSTEM_INFO_TTL_SECONDS = 5
+
+# Per-minute transaction aggregates are kept this long for get_business_summary
+BUSINESS_SUMMARY_RETENTION_HOURS = int(os.getenv('BUSINESS_SUMMARY_RETENTION_HOURS', '168'))
+
+_SUCCESS_STATUSES = frozenset({'matched', 'partially_matched'})
+
+# Alert evaluation reuses the latest health summary while it is this fresh
+ALERT_HEALTH_MAX_AGE_SECONDS = 60
+
+# Comparisons accepted by AlertManager.add_threshold_rule
+_THRESHOLD_OPS = frozenset({'>', '>=', '<', '<=', '==', '!='})
+
+# Most recent fired alerts kept in AlertManager.alert_history
+ALERT_HISTORY_MAX = int(os.getenv('ALERT_HISTORY_MAX', '1000'))
+
+# Upper bound for the monitoring loop's backoff after consecutive failures
+MONITORING_MAX_BACKOFF_SECONDS = 300
+
+# Telemetry buffering: oldest items are dropped once the buffer is full.
+# The buffer is exported once it holds TELEMETRY_BATCH_SIZE items, and at
+# least every TELEMETRY_FLUSH_INTERVAL seconds while it holds any
+TELEMETRY_BUFFER_SIZE = int(os.getenv('TELEMETRY_BUFFER_SIZE', '10000'))
+TELEMETRY_BATCH_SIZE = int(os.getenv('TELEMETRY_BATCH_SIZE', '100'))
+# TELEMETRY_IMMEDIATE=1 sends each item as soon as the event loop is free
+# (items tracked in the same loop iteration still share a request); meant
+# for low-volume services where waiting for a batch only delays visibility
+TELEMETRY_IMMEDIATE = os.getenv('TELEMETRY_IMMEDIATE') == '1'
+# Items per export request when a flush drains a large backlog
+TELEMETRY_EXPORT_MAX_ITEMS = int(os.getenv('TELEMETRY_EXPORT_MAX_ITEMS', '1000'))
+# Time limit for the monitoring loop's immediate (critical alert) flushes
+TELEMETRY_FLUSH_TIMEOUT_SECONDS = float(os.getenv('TELEMETRY_FLUSH_TIMEOUT', '2'))
+TELEMETRY_FLUSH_INTERVAL_SECONDS = float(os.getenv('TELEMETRY_FLUSH_INTERVAL', '5'))
+
+# MetricsCollector forwards accumulated metric deltas to Application Insights
+# this often instead of once per recorded value
+METRICS_FORWARD_INTERVAL_SECONDS = float(os.getenv('METRICS_FORWARD_INTERVAL', '1'))
+
+
+def _dumps_json(payload: Dict[str, Any]) -> bytes:
+    """Serialize a response payload to JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=str)
+    return json.dumps(payload, default=str).encode()
+
+
+@lru_cache(maxsize=4096)
+def _format_label_suffix(label_items: tuple) -> str:
+    """Metric key suffix for one label set; hot label sets are formatted once"""
+    label_str = ','.join(f"{k}={v}" for k, v in sorted(label_items))
+    return f"[{label_str}]"
+
+
+@lru_cache(maxsize=8)
+def _disk_usage(path: str, interval_bucket: int):
+    """psutil.disk_usage cached per path for one interval bucket"""
+    return psutil.disk_usage(path)
+
+# Application Insights ingestion; the whole buffer goes out as one gzipped request
+APPINSIGHTS_INGESTION_ENDPOINT = os.getenv(
+    'APPINSIGHTS_INGESTION_ENDPOINT', 'https://dc.services.visualstudio.com/v2/track'
+)
+
+_ENVELOPE_TYPES = {
+    'event': ('Microsoft.ApplicationInsights.Event', 'EventData'),
+    'metric': ('Microsoft.ApplicationInsights.Metric', 'MetricData'),
+    'exception': ('Microsoft.ApplicationInsights.Exception', 'ExceptionData'),
+    'dependency': ('Microsoft.ApplicationInsights.RemoteDependency', 'RemoteDependencyData')
+}
+
+_TELEMETRY_HEADERS = {
+    'Content-Type': 'application/json',
+    'Content-Encoding': 'gzip'
+}
+
+# One keep-alive client shared by every ApplicationInsights instance
+_telemetry_client = None
+
+def get_telemetry_client():
+    """Get the shared httpx client used to export telemetry"""
+    global _telemetry_client
+    if _telemetry_client is None or _telemetry_client.is_closed:
+        import httpx
+        
+        _telemetry_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=4, max_connections=8, keepalive_expiry=60.0),
+            timeout=httpx.Timeout(10.0)
+        )
+    return _telemetry_client
+
+async def close_telemetry_client():
+    """Close the shared telemetry client; call on service shutdown"""
+    global _telemetry_client
+    if _telemetry_client is not None:
+        await _telemetry_client.aclose()
+        _telemetry_client = None
+
+async def _cancel_task(task: Optional[asyncio.Task]):
+    """Cancel a background task and wait until it has stopped"""
+    if task is not None and not task.done():
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+def _format_duration(duration_ms: int) -> str:
+    """Render milliseconds in Application Insights' d.hh:mm:ss.fff form"""
+    duration_ms = int(duration_ms)
+    seconds, ms = divmod(duration_ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    return f"{days}.{hours:02d}:{minutes:02d}:{seconds:02d}.{ms:03d}"
+
+class TelemetryRingBuffer:
+    """
+    Bounded buffer shared by everything that reports through one
+    ApplicationInsights client; the oldest items are dropped on overflow
+    Producers may append from worker threads.
+    """
+    
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self.dropped = 0
+        self._items = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def append(self, item: Dict[str, Any]):
+        with self._lock:
+            if len(self._items) == self.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+    
+    def requeue(self, items: List[Dict[str, Any]]):
+        """Put items taken for an export that didn't complete back at the front"""
+        with self._lock:
+            room = self.maxlen - len(self._items)
+            if room < len(items):
+                # Keep the newest items, as appending would
+                self.dropped += len(items) - room
+                items = items[len(items) - room:] if room > 0 else []
+            self._items.extendleft(reversed(items))
+    
+    def take(self, count: int) -> List[Dict[str, Any]]:
+        """Remove and return up to count of the oldest items"""
+        with self._lock:
+            items = self._items
+            return [items.popleft() for _ in range(min(count, len(items)))]
+
+# Application Insights integration
 class ApplicationInsights:
     """Application Insights telemetry client"""
     
-    def __init__(self, instrumentation_key: str):
+    def __init__(self, 
+                 instrumentation_key: str,
+                 max_buffer: int = TELEMETRY_BUFFER_SIZE,
+                 flush_interval: float = TELEMETRY_FLUSH_INTERVAL_SECONDS,
+                 batch_size: int = TELEMETRY_BATCH_SIZE,
+                 immediate: bool = TELEMETRY_IMMEDIATE):
         self.instrumentation_key = instrumentation_key
-        self.telemetry_buffer = []
+        self.max_buffer = max_buffer
+        self.flush_interval = flush_interval
+        self.immediate = immediate
+        self.batch_size = 1 if immediate else batch_size
+        self.telemetry_buffer = TelemetryRingBuffer(max_buffer)
         self.enabled = bool(instrumentation_key)
+        self.ingestion_endpoint = APPINSIGHTS_INGESTION_ENDPOINT
+        self._flush_task = None
+        self._flush_wakeup = None
+        self._closed = False
+        
+        if not self.enabled:
+            # Bind no-ops so disabled telemetry costs callers nothing per call
+            self.track_event = self.track_metric = self._noop
+            self.track_exception = self.track_dependency = self._noop
+            self.flush = self._anoop
+    
+    def _noop(self, *args, **kwargs):
+        """Stand-in for the track_* methods when telemetry is disabled"""
+    
+    async def _anoop(self):
+        """Stand-in for flush() when telemetry is disabled"""
+    
+    def _enqueue(self, item: Dict[str, Any]):
+        """Buffer a telemetry item, starting the background flusher on first use"""
+        self.telemetry_buffer.append(item)
+        
+        if len(self.telemetry_buffer) >= self.batch_size and self._flush_wakeup is not None:
+            self._flush_wakeup.set()
+        
+        if not self._closed and (self._flush_task is None or self._flush_task.done()):
+            try:
+                self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+            except RuntimeError:
+                # No running loop (sync caller); the next tracked item starts it
+                pass
+    
+    async def _flush_loop(self):
+        """Flush the buffer when a batch is full or every flush_interval seconds"""
+        self._flush_wakeup = asyncio.Event()
+        if len(self.telemetry_buffer) >= self.batch_size:
+            # Filled before this task first ran
+            self._flush_wakeup.set()
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("Telemetry flush failed: %s", e)
+    
+    async def aclose(self):
+        """
+        Stop the background flusher
+        
+        A batch it was exporting goes back to the buffer, so a final flush()
+        afterwards sends everything without racing the flusher.
+        """
+        self._closed = True
+        await _cancel_task(self._flush_task)
+        self._flush_task = None
+        self._flush_wakeup = None
     
     def track_event(self, name: str, properties: Dict[str, Any] = None, measurements: Dict[str, float] = None):
         """Track custom event"""
-        if not self.enabled:
-            return
-        
         event = {
             'type': 'event',
             'name': name,
-            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'timestamp': format_epoch_timestamp(time.time()),
             'properties': properties or {},
             'measurements': measurements or {}
         }
         
-        self.telemetry_buffer.append(event)
-        logger.debug(f"Tracked event: {name}")
+        self._enqueue(event)
+        logger.debug("Tracked event: %s", name)
     
-    def track_metric(self, name: str, value: float, properties: Dict[str, str] = None):
-        """Track custom metric"""
-        if not self.enabled:
-            return
+    def track_metric(self, name: str, value: float, properties: Dict[str, str] = None,
+                     count: int = None, min_value: float = None, max_value: float = None):
+        """
+        Track custom metric
         
+        Pass count/min_value/max_value to send a pre-aggregated metric, in which
+        case value is the sum of the aggregated samples
+        """
         metric = {
             'type': 'metric',
             'name': name,
             'value': value,
-            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'timestamp': format_epoch_timestamp(time.time()),
             'properties': properties or {}
         }
+        if count is not None:
+            metric['aggregate'] = (count, min_value, max_value)
         
-        self.telemetry_buffer.append(metric)
+        self._enqueue(metric)
     
     def track_exception(self, exception: Exception, properties: Dict[str, Any] = None):
         """Track exception"""
-        if not self.enabled:
-            return
-        
         exc_data = {
             'type': 'exception',
             'exception_type': type(exception).__name__,
             'message': str(exception),
-            'stack_trace': traceback.format_exc(),
-            'timestamp': datetime.now(timezone.utc).isoformat(),
+            # Frames are summarized now so the buffer holds no reference to the
+            # exception or its frames; source lines are read at flush time
+            '_traceback': traceback.TracebackException.from_exception(exception, lookup_lines=False),
+            'timestamp': format_epoch_timestamp(time.time()),
             'properties': properties or {}
         }
         
-        self.telemetry_buffer.append(exc_data)
-        logger.debug(f"Tracked exception: {type(exception).__name__}")
+        self._enqueue(exc_data)
+        logger.debug("Tracked exception: %s", type(exception).__name__)
     
     def track_dependency(self, name: str, type_name: str, data: str, success: bool, duration_ms: int):
         """Track dependency call"""
-        if not self.enabled:
-            return
-        
         dependency = {
             'type': 'dependency',
             'name': name,
@@ -88,19 +337,102 @@ class ApplicationInsights:
             'data': data,
             'success': success,
             'duration_ms': duration_ms,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': format_epoch_timestamp(time.time())
         }
         
-        self.telemetry_buffer.append(dependency)
+        self._enqueue(dependency)
     
     async def flush(self):
         """Flush telemetry buffer"""
-        if not self.enabled or not self.telemetry_buffer:
-            return
+        # Drain everything buffered when the flush starts, one request per
+        # TELEMETRY_EXPORT_MAX_ITEMS; items added meanwhile wait for the next flush
+        pending = len(self.telemetry_buffer)
+        while pending > 0:
+            batch = self.telemetry_buffer.take(min(pending, TELEMETRY_EXPORT_MAX_ITEMS))
+            if not batch:
+                break
+            pending -= len(batch)
+            try:
+                await self._export(batch)
+            except BaseException:
+                # Transport error, timeout or shutdown: keep the batch for the next flush
+                self.telemetry_buffer.requeue(batch)
+                raise
+    
+    def _encode(self, batch: List[Dict[str, Any]]) -> bytes:
+        """Format stack traces and build the gzipped envelope payload"""
+        for item in batch:
+            summary = item.pop('_traceback', None)
+            if summary is not None:
+                item['stack_trace'] = ''.join(summary.format())
+        
+        return gzip.compress(dumps_log_entry([self._to_envelope(item) for item in batch]).encode())
+    
+    async def _export(self, batch: List[Dict[str, Any]]):
+        """Send one batch of telemetry items as a single gzipped request"""
+        # Serialization and compression are CPU-bound; keep them off the event loop
+        body = await asyncio.to_thread(self._encode, batch)
+        response = await get_telemetry_client().post(
+            self.ingestion_endpoint, content=body, headers=_TELEMETRY_HEADERS
+        )
         
-        # In production, would send to Application Insights
-        logger.info(f"Flushed {len(self.telemetry_buffer)} telemetry items")
-        self.telemetry_buffer.clear()
+        if response.status_code >= 400:
+            logger.warning("Telemetry export rejected: HTTP %s", response.status_code, extra={
+                'items': len(batch)
+            })
+        else:
+            logger.info("Flushed %d telemetry items", len(batch))
+    
+    def _to_envelope(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Wrap a buffered item in the Application Insights envelope schema"""
+        kind = item['type']
+        
+        if kind == 'event':
+            base_data = {
+                'ver': 2,
+                'name': item['name'],
+                'properties': item['properties'],
+                'measurements': item['measurements']
+            }
+        elif kind == 'metric':
+            data_point = {'name': item['name'], 'value': item['value']}
+            aggregate = item.get('aggregate')
+            if aggregate is not None:
+                count, min_value, max_value = aggregate
+                data_point.update(kind=1, count=count, min=min_value, max=max_value)
+            base_data = {
+                'ver': 2,
+                'metrics': [data_point],
+                'properties': item['properties']
+            }
+        elif kind == 'exception':
+            base_data = {
+                'ver': 2,
+                'exceptions': [{
+                    'typeName': item['exception_type'],
+                    'message': item['message'],
+                    'hasFullStack': True,
+                    'stack': item.get('stack_trace')
+                }],
+                'properties': item['properties']
+            }
+        else:
+            base_data = {
+                'ver': 2,
+                'name': item['name'],
+                'type': item['dependency_type'],
+                'data': item['data'],
+                'success': item['success'],
+                'duration': _format_duration(item['duration_ms'])
+            }
+        
+        envelope_name, base_type = _ENVELOPE_TYPES[kind]
+        return {
+            'name': envelope_name,
+            'time': item['timestamp'],
+            'iKey': self.instrumentation_key,
+            'data': {'baseType': base_type, 'baseData': base_data}
+        }
 
 class HealthStatus(str, Enum):
     """Health check status values"""
@@ -108,7 +440,7 @@ class HealthStatus(str, Enum):
     DEGRADED = "degraded"
     UNHEALTHY = "unhealthy"
 
-@dataclass
+@dataclass(slots=True)
 class HealthCheck:
     """Individual health check definition"""
     name: str
@@ -116,8 +448,9 @@ class HealthCheck:
     timeout_seconds: int = 30
     critical: bool = True
     interval_seconds: int = 60
+    blocking: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class HealthCheckResult:
     """Result of a health check"""
     name: str
@@ -131,6 +464,21 @@ class HealthCheckResult:
         if self.timestamp is None:
             self.timestamp = datetime.now(timezone.utc)
 
+class ProbeResult(NamedTuple):
+    """Outcome of one of the standard health check functions below"""
+    status: str
+    message: Optional[str] = None
+    details: Optional[Dict[str, Any]] = None
+    response_time_ms: Optional[int] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Dict form for HTTP responses; unset fields are omitted"""
+        return {field: value for field, value in zip(self._fields, self) if value is not None}
+
+# Status values are module constants so results compare against one object
+_HEALTHY = HealthStatus.HEALTHY.value
+_UNHEALTHY = HealthStatus.UNHEALTHY.value
+
 class ComprehensiveHealthChecker:
     """
     Comprehensive health checking system
@@ -141,23 +489,47 @@ class ComprehensiveHealthChecker:
         self.service_name = service_name
         self.checks = {}
         self.last_results = {}
-        self.check_history = []
         self.max_history = 100
+        self.check_history = deque(maxlen=self.max_history)
+        # Epoch seconds of each check_history entry, oldest first
+        self._history_times = deque(maxlen=self.max_history)
+        # Process handle and interpreter info never change; resolve them once.
+        # Reusing the handle also lets process.cpu_percent() measure since the last call.
+        self._process = psutil.Process()
+        self._python_info = {
+            'version': os.sys.version,
+            'platform': os.sys.platform
+        }
+        # Prime psutil's CPU counter so non-blocking samples measure from here
+        psutil.cpu_percent(interval=None)
+        self._cpu_percent = 0.0
+        self._cpu_task = None
+        self._system_info = None
+        self._system_info_at = 0.0
     
     def add_check(self, check: HealthCheck):
         """Add health check"""
+        if check.blocking:
+            # Synchronous checks are classified once here and run in a worker thread
+            check.check_function = partial(asyncio.to_thread, check.check_function)
+            check.blocking = False
         self.checks[check.name] = check
-        logger.info(f"Added health check: {check.name}")
+        logger.info("Added health check: %s", check.name)
     
-    def add_simple_check(self, name: str, check_function: Callable, critical: bool = True):
+    def add_simple_check(self, name: str, check_function: Callable, critical: bool = True, blocking: bool = False):
         """Add simple health check with defaults"""
         check = HealthCheck(
             name=name,
             check_function=check_function,
-            critical=critical
+            critical=critical,
+            blocking=blocking
         )
         self.add_check(check)
     
+    def add_service_check(self, name: str, service_url: str, critical: bool = True, client=None):
+        """Add a health probe for a dependent service; probes share one pooled HTTP client"""
+        self.add_simple_check(name, partial(check_service_health, service_url, client=client), critical=critical)
+    
     async def run_all_checks(self) -> Dict[str, Any]:
         """
         Run all health checks and return comprehensive status
@@ -165,13 +537,14 @@ class ComprehensiveHealthChecker:
         Returns:
             Complete health status with all check results
         """
-        start_time = time.time()
+        start_time = time.monotonic_ns()
         
         try:
-            # Run all checks concurrently
+            # Run all checks concurrently; snapshot the checks so results zip back to them
+            check_items = list(self.checks.items())
             check_tasks = [
                 self._run_single_check(check)
-                for check in self.checks.values()
+                for _, check in check_items
             ]
             
             check_results = await asyncio.gather(*check_tasks, return_exceptions=True)
@@ -180,11 +553,9 @@ class ComprehensiveHealthChecker:
             results = {}
             critical_failures = 0
             total_checks = len(check_tasks)
+            status_counts = {status: 0 for status in HealthStatus}
             
-            for i, result in enumerate(check_results):
-                check_name = list(self.checks.keys())[i]
-                check = self.checks[check_name]
-                
+            for (check_name, check), result in zip(check_items, check_results):
                 if isinstance(result, Exception):
                     # Check failed with exception
                     health_result = HealthCheckResult(
@@ -202,17 +573,18 @@ class ComprehensiveHealthChecker:
                 
                 results[check_name] = health_result
                 self.last_results[check_name] = health_result
+                status_counts[health_result.status] += 1
             
             # Determine overall status
             if critical_failures > 0:
                 overall_status = HealthStatus.UNHEALTHY
-            elif any(r.status == HealthStatus.DEGRADED for r in results.values()):
+            elif status_counts[HealthStatus.DEGRADED]:
                 overall_status = HealthStatus.DEGRADED
             else:
                 overall_status = HealthStatus.HEALTHY
             
             # Create comprehensive response
-            total_time = int((time.time() - start_time) * 1000)
+            total_time = (time.monotonic_ns() - start_time) // 1_000_000
             
             health_summary = {
                 'service': self.service_name,
@@ -225,29 +597,28 @@ class ComprehensiveHealthChecker:
                         'response_time_ms': result.response_time_ms,
                         'message': result.message,
                         'details': result.details,
-                        'critical': self.checks[name].critical
+                        'critical': check.critical
                     }
-                    for name, result in results.items()
+                    for (name, check), result in zip(check_items, results.values())
                 },
                 'summary': {
                     'total_checks': total_checks,
-                    'healthy_checks': sum(1 for r in results.values() if r.status == HealthStatus.HEALTHY),
-                    'degraded_checks': sum(1 for r in results.values() if r.status == HealthStatus.DEGRADED),
-                    'unhealthy_checks': sum(1 for r in results.values() if r.status == HealthStatus.UNHEALTHY),
+                    'healthy_checks': status_counts[HealthStatus.HEALTHY],
+                    'degraded_checks': status_counts[HealthStatus.DEGRADED],
+                    'unhealthy_checks': status_counts[HealthStatus.UNHEALTHY],
                     'critical_failures': critical_failures
                 },
                 'system_info': await self._get_system_info()
             }
             
-            # Store in history
+            # Store in history; the deques evict the oldest entry
             self.check_history.append(health_summary)
-            if len(self.check_history) > self.max_history:
-                self.check_history.pop(0)
+            self._history_times.append(time.time())
             
             return health_summary
             
         except Exception as e:
-            logger.error(f"Health check execution failed: {e}")
+            logger.error("Health check execution failed: %s", e)
             return {
                 'service': self.service_name,
                 'status': HealthStatus.UNHEALTHY.value,
@@ -256,9 +627,27 @@ class ComprehensiveHealthChecker:
                 'system_info': await self._get_system_info()
             }
     
+    async def get_recent_health(self, max_age_seconds: float) -> Dict[str, Any]:
+        """
+        Get the latest health summary, re-running the checks only when it is
+        older than max_age_seconds
+        """
+        if self._history_times and time.time() - self._history_times[-1] <= max_age_seconds:
+            return self.check_history[-1]
+        return await self.run_all_checks()
+    
+    async def run_all_checks_json(self) -> bytes:
+        """
+        Run all health checks and return the status serialized as JSON
+        
+        For health endpoints: the summary is encoded once, with orjson when it
+        is installed, instead of going through the framework's encoder.
+        """
+        return _dumps_json(await self.run_all_checks())
+    
     async def _run_single_check(self, check: HealthCheck) -> HealthCheckResult:
         """Run individual health check with timeout"""
-        start_time = time.time()
+        start_time = time.monotonic_ns()
         
         try:
             # Run check with timeout
@@ -267,10 +656,18 @@ class ComprehensiveHealthChecker:
                 timeout=check.timeout_seconds
             )
             
-            response_time = int((time.time() - start_time) * 1000)
+            response_time = (time.monotonic_ns() - start_time) // 1_000_000
             
             # Parse result
-            if isinstance(result, dict):
+            if isinstance(result, ProbeResult):
+                return HealthCheckResult(
+                    name=check.name,
+                    status=HealthStatus(result.status),
+                    response_time_ms=response_time,
+                    message=result.message,
+                    details=result.details
+                )
+            elif isinstance(result, dict):
                 status_str = result.get('status', 'healthy')
                 status = HealthStatus(status_str) if status_str in ['healthy', 'degraded', 'unhealthy'] else HealthStatus.HEALTHY
                 
@@ -299,7 +696,7 @@ class ComprehensiveHealthChecker:
                 )
                 
         except asyncio.TimeoutError:
-            response_time = int((time.time() - start_time) * 1000)
+            response_time = (time.monotonic_ns() - start_time) // 1_000_000
             return HealthCheckResult(
                 name=check.name,
                 status=HealthStatus.UNHEALTHY,
@@ -307,7 +704,7 @@ class ComprehensiveHealthChecker:
                 message=f"Check timed out after {check.timeout_seconds}s"
             )
         except Exception as e:
-            response_time = int((time.time() - start_time) * 1000)
+            response_time = (time.monotonic_ns() - start_time) // 1_000_000
             return HealthCheckResult(
                 name=check.name,
                 status=HealthStatus.UNHEALTHY,
@@ -315,50 +712,74 @@ class ComprehensiveHealthChecker:
                 message=f"Check failed: {str(e)}"
             )
     
+    async def _sample_cpu(self):
+        """Refresh the system CPU gauge every CPU_SAMPLE_INTERVAL_SECONDS"""
+        while True:
+            await asyncio.sleep(CPU_SAMPLE_INTERVAL_SECONDS)
+            self._cpu_percent = psutil.cpu_percent(interval=None)
+    
+    async def aclose(self):
+        """Stop the background CPU sampler"""
+        await _cancel_task(self._cpu_task)
+        self._cpu_task = None
+    
+    def _snapshot_sync(self, cpu_percent: float) -> Dict[str, Any]:
+        """Read process and system stats; each psutil call is a /proc read"""
+        process = self._process
+        # oneshot() lets the process calls share one read of the process stat files
+        with process.oneshot():
+            process_info = {
+                'pid': process.pid,
+                'cpu_percent': process.cpu_percent(),
+                'memory_percent': process.memory_percent(),
+                'memory_rss_mb': process.memory_info().rss / _MIB,
+                'num_threads': process.num_threads(),
+                'create_time': process.create_time()
+            }
+        memory = psutil.virtual_memory()
+        disk = _disk_usage('/', int(time.monotonic() // DISK_USAGE_INTERVAL_SECONDS))
+        
+        return {
+            'process': process_info,
+            'system': {
+                'cpu_percent': cpu_percent,
+                'memory_percent': memory.percent,
+                'memory_available_gb': memory.available / _GIB,
+                'disk_percent': disk.percent,
+                'disk_free_gb': disk.free / _GIB
+            },
+            'python': self._python_info
+        }
+    
     async def _get_system_info(self) -> Dict[str, Any]:
-        """Get system resource information"""
+        """Get system resource information, reused for SYSTEM_INFO_TTL_SECONDS"""
         try:
-            # Get process info
-            process = psutil.Process()
+            now = time.monotonic()
+            if self._system_info is not None and now - self._system_info_at < SYSTEM_INFO_TTL_SECONDS:
+                return self._system_info
             
-            # Get system info
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            # System CPU comes from the background sampler; the first call
+            # starts it and reads usage since the counter was primed
+            if self._cpu_task is None or self._cpu_task.done():
+                self._cpu_percent = psutil.cpu_percent(interval=None)
+                self._cpu_task = asyncio.create_task(self._sample_cpu())
             
-            return {
-                'process': {
-                    'pid': process.pid,
-                    'cpu_percent': process.cpu_percent(),
-                    'memory_percent': process.memory_percent(),
-                    'memory_rss_mb': process.memory_info().rss / 1024 / 1024,
-                    'num_threads': process.num_threads(),
-                    'create_time': process.create_time()
-                },
-                'system': {
-                    'cpu_percent': cpu_percent,
-                    'memory_percent': memory.percent,
-                    'memory_available_gb': memory.available / 1024 / 1024 / 1024,
-                    'disk_percent': disk.percent,
-                    'disk_free_gb': disk.free / 1024 / 1024 / 1024
-                },
-                'python': {
-                    'version': os.sys.version,
-                    'platform': os.sys.platform
-                }
-            }
+            # The remaining psutil reads run together in a worker thread
+            self._system_info = await asyncio.to_thread(self._snapshot_sync, self._cpu_percent)
+            self._system_info_at = now
+            return self._system_info
         except Exception as e:
-            logger.warning(f"Failed to get system info: {e}")
+            logger.warning("Failed to get system info: %s", e)
             return {'error': str(e)}
     
     def get_health_history(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Get health check history for specified hours"""
-        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
+        cutoff_time = time.time() - hours * 3600
         
-        return [
-            entry for entry in self.check_history
-            if datetime.fromisoformat(entry['timestamp'].replace('Z', '+00:00')) > cutoff_time
-        ]
+        # History is appended in time order, so everything after the cutoff
+        # position is recent enough
+        start = bisect.bisect_right(self._history_times, cutoff_time)
+        return list(itertools.islice(self.check_history, start, None))
 
 class MetricsCollector:
     """
@@ -366,13 +787,29 @@ class MetricsCollector:
     Collects business and technical metrics
     """
     
+    __slots__ = (
+        'service_name', 'app_insights', 'metrics', 'counters', 'histograms', 'gauges',
+        '_ai_series', '_pending_counters', '_pending_gauges', '_pending_histograms',
+        '_forward_task'
+    )
+    
     def __init__(self, service_name: str, app_insights: ApplicationInsights = None):
         self.service_name = service_name
-        self.app_insights = app_insights
+        # A disabled client is dropped so the forwarding branches below are skipped
+        self.app_insights = app_insights if app_insights and app_insights.enabled else None
         self.metrics = {}
         self.counters = {}
         self.histograms = {}
         self.gauges = {}
+        
+        # Application Insights forwarding: values accumulate per metric key and
+        # go out once per forward interval (counter deltas, last gauge value,
+        # histogram count/sum/min/max)
+        self._ai_series: Dict[str, tuple] = {}
+        self._pending_counters: Dict[str, float] = {}
+        self._pending_gauges: Dict[str, float] = {}
+        self._pending_histograms: Dict[str, list] = {}
+        self._forward_task = None
     
     def increment_counter(self, name: str, value: int = 1, labels: Dict[str, str] = None):
         """Increment counter metric"""
@@ -380,7 +817,7 @@ class MetricsCollector:
         self.counters[key] = self.counters.get(key, 0) + value
         
         if self.app_insights:
-            self.app_insights.track_metric(name, value, labels)
+            self._pend_counter(key, name, value, labels)
     
     def set_gauge(self, name: str, value: float, labels: Dict[str, str] = None):
         """Set gauge metric value"""
@@ -392,33 +829,163 @@ class MetricsCollector:
         }
         
         if self.app_insights:
-            self.app_insights.track_metric(name, value, labels)
+            if key not in self._ai_series:
+                self._add_series(key, name, labels)
+            self._pending_gauges[key] = value
+            self._ensure_forwarding()
     
     def record_histogram(self, name: str, value: float, labels: Dict[str, str] = None):
         """Record histogram value"""
         key = self._make_metric_key(name, labels)
-        if key not in self.histograms:
-            self.histograms[key] = {
-                'values': [],
-                'labels': labels or {}
-            }
+        self._append_histogram(key, value, labels)
+        
+        if self.app_insights:
+            self._pend_histogram(key, name, value, labels)
+    
+    def record_batch(self, 
+                     labels: Dict[str, str] = None,
+                     counters: Dict[str, int] = None,
+                     histograms: Dict[str, float] = None):
+        """
+        Apply several counter increments and histogram values sharing one label set
         
-        self.histograms[key]['values'].append(value)
+        The label part of the metric key is formatted once for the whole batch.
+        """
+        suffix = self._make_label_suffix(labels)
+        forward = self.app_insights is not None
         
-        # Keep only last 1000 values for memory efficiency
-        if len(self.histograms[key]['values']) > 1000:
-            self.histograms[key]['values'] = self.histograms[key]['values'][-1000:]
+        for name, value in (counters or {}).items():
+            key = name + suffix
+            self.counters[key] = self.counters.get(key, 0) + value
+            if forward:
+                self._pend_counter(key, name, value, labels)
         
-        if self.app_insights:
-            self.app_insights.track_metric(name, value, labels)
+        for name, value in (histograms or {}).items():
+            key = name + suffix
+            self._append_histogram(key, value, labels)
+            if forward:
+                self._pend_histogram(key, name, value, labels)
+    
+    def _add_series(self, key: str, name: str, labels: Dict[str, str] = None):
+        """Remember the metric name and labels forwarded for a metric key"""
+        self._ai_series[key] = (name, labels)
+    
+    def _pend_counter(self, key: str, name: str, value: float, labels: Dict[str, str] = None):
+        """Accumulate a counter delta for the next forward"""
+        pending = self._pending_counters
+        if key not in pending:
+            if key not in self._ai_series:
+                self._add_series(key, name, labels)
+            self._ensure_forwarding()
+            pending[key] = value
+        else:
+            pending[key] += value
+    
+    def _pend_histogram(self, key: str, name: str, value: float, labels: Dict[str, str] = None):
+        """Fold a histogram value into the next forward's count/sum/min/max"""
+        aggregate = self._pending_histograms.get(key)
+        if aggregate is None:
+            if key not in self._ai_series:
+                self._add_series(key, name, labels)
+            self._ensure_forwarding()
+            self._pending_histograms[key] = [1, value, value, value]
+            return
+        
+        aggregate[0] += 1
+        aggregate[1] += value
+        if value < aggregate[2]:
+            aggregate[2] = value
+        elif value > aggregate[3]:
+            aggregate[3] = value
+    
+    def _ensure_forwarding(self):
+        """Start the background forwarder if it isn't running"""
+        if self._forward_task is None or self._forward_task.done():
+            try:
+                self._forward_task = asyncio.get_running_loop().create_task(self._forward_loop())
+            except RuntimeError:
+                # No running loop (sync caller); values wait for the next
+                # forward_pending() call or a later async caller
+                pass
+    
+    async def _forward_loop(self):
+        """Forward pending metrics every METRICS_FORWARD_INTERVAL_SECONDS"""
+        while True:
+            await asyncio.sleep(METRICS_FORWARD_INTERVAL_SECONDS)
+            try:
+                self.forward_pending()
+            except Exception as e:
+                logger.error("Metric forwarding failed: %s", e)
+    
+    async def aclose(self):
+        """Stop the background forwarder and forward what is still pending"""
+        await _cancel_task(self._forward_task)
+        self._forward_task = None
+        self.forward_pending()
+    
+    def forward_pending(self):
+        """Hand all accumulated metric values to Application Insights"""
+        if not self.app_insights:
+            return
+        
+        counters, self._pending_counters = self._pending_counters, {}
+        gauges, self._pending_gauges = self._pending_gauges, {}
+        histograms, self._pending_histograms = self._pending_histograms, {}
+        
+        series = self._ai_series
+        track_metric = self.app_insights.track_metric
+        
+        for values in (counters, gauges):
+            for key, value in values.items():
+                name, labels = series[key]
+                track_metric(name, value, labels)
+        
+        for key, (count, total, min_value, max_value) in histograms.items():
+            name, labels = series[key]
+            track_metric(name, total, labels, count=count, min_value=min_value, max_value=max_value)
+    
+    def _append_histogram(self, key: str, value: float, labels: Dict[str, str] = None):
+        """Append a value to the histogram stored under key"""
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            # Keep only last 1000 values for memory efficiency
+            histogram = self.histograms[key] = {
+                'values': deque(maxlen=1000),
+                'labels': labels or {},
+                'stats': None
+            }
+        
+        histogram['values'].append(value)
+        histogram['stats'] = None
     
     def _make_metric_key(self, name: str, labels: Dict[str, str] = None) -> str:
         """Create metric key with labels"""
+        return name + self._make_label_suffix(labels)
+    
+    def _make_label_suffix(self, labels: Dict[str, str] = None) -> str:
+        """Format the label part of a metric key"""
         if not labels:
-            return name
+            return ''
         
-        label_str = ','.join(f"{k}={v}" for k, v in sorted(labels.items()))
-        return f"{name}[{label_str}]"
+        return _format_label_suffix(tuple(labels.items()))
+    
+    @staticmethod
+    def _histogram_stats(values) -> Dict[str, float]:
+        """Summary statistics for one histogram window"""
+        # Samples are appended to a deque (cheaper per value than writing into
+        # an array); the window is copied into an array once here so sorting
+        # and the mean run in NumPy
+        count = len(values)
+        values_sorted = np.sort(np.fromiter(values, dtype=np.float64, count=count))
+        return {
+            'count': count,
+            'min': float(values_sorted[0]),
+            'max': float(values_sorted[-1]),
+            'mean': float(values_sorted.mean()),
+            'p50': float(values_sorted[count // 2]),
+            'p95': float(values_sorted[int(count * 0.95)]),
+            'p99': float(values_sorted[int(count * 0.99)])
+        }
     
     def get_metrics_summary(self) -> Dict[str, Any]:
         """Get summary of all collected metrics"""
@@ -432,20 +999,14 @@ class MetricsCollector:
             'histograms': {}
         }
         
-        # Calculate histogram statistics
+        # Histogram statistics are recomputed only for windows that changed
+        # since the last summary
         for key, data in self.histograms.items():
-            values = data['values']
-            if values:
-                values_sorted = sorted(values)
-                summary['histograms'][key] = {
-                    'count': len(values),
-                    'min': min(values),
-                    'max': max(values),
-                    'mean': sum(values) / len(values),
-                    'p50': values_sorted[len(values_sorted) // 2],
-                    'p95': values_sorted[int(len(values_sorted) * 0.95)],
-                    'p99': values_sorted[int(len(values_sorted) * 0.99)]
-                }
+            stats = data['stats']
+            if stats is None and data['values']:
+                stats = data['stats'] = self._histogram_stats(data['values'])
+            if stats is not None:
+                summary['histograms'][key] = stats
         
         return summary
 
@@ -455,9 +1016,52 @@ class BusinessMetricsTracker:
     Provides insights into processing performance and accuracy
     """
     
+    __slots__ = ('metrics', '_buckets', '_bucket_retention')
+    
     def __init__(self, metrics_collector: MetricsCollector):
         self.metrics = metrics_collector
-        self.business_events = []
+        
+        # Running transaction aggregates per minute (epoch // 60), oldest first;
+        # summaries add up the buckets in the window instead of every event
+        self._buckets: 'OrderedDict[int, Dict[str, Any]]' = OrderedDict()
+        self._bucket_retention = BUSINESS_SUMMARY_RETENTION_HOURS * 60
+    
+    def _record_transaction(self, timestamp: float, amount: float, currency: str,
+                            processing_time_ms: int, successful: bool, client_id: Optional[str]):
+        """Add one transaction to its minute bucket"""
+        minute = int(timestamp // 60)
+        bucket = self._buckets.get(minute)
+        if bucket is None and self._buckets and minute < next(reversed(self._buckets)):
+            # Clock stepped back; count it in the newest minute to keep buckets ordered
+            bucket = self._buckets[next(reversed(self._buckets))]
+        if bucket is None:
+            bucket = self._buckets[minute] = {
+                'count': 0,
+                'successful': 0,
+                'amount': 0.0,
+                'processing_time_ms': 0.0,
+                'by_currency': {},
+                'clients': set()
+            }
+            oldest = minute - self._bucket_retention
+            while next(iter(self._buckets)) <= oldest:
+                self._buckets.popitem(last=False)
+        
+        bucket['count'] += 1
+        if successful:
+            bucket['successful'] += 1
+        bucket['amount'] += amount
+        bucket['processing_time_ms'] += processing_time_ms
+        
+        currency_totals = bucket['by_currency'].get(currency)
+        if currency_totals is None:
+            bucket['by_currency'][currency] = [1, amount]
+        else:
+            currency_totals[0] += 1
+            currency_totals[1] += amount
+        
+        if client_id:
+            bucket['clients'].add(client_id)
     
     def track_transaction_processed(self, 
                                    transaction_id: str,
@@ -471,31 +1075,28 @@ class BusinessMetricsTracker:
             'status': status,
             'currency': currency
         }
+        # Histograms keep per-key sample windows, so unbounded client ids are
+        # folded into a fixed number of buckets there; counters keep the raw id
+        histogram_labels = dict(labels)
         if client_id:
             labels['client_id'] = client_id
+            histogram_labels['client_bucket'] = f"tier_{zlib.crc32(client_id.encode()) % CLIENT_BUCKETS}"
+        
+        successful = status in _SUCCESS_STATUSES
         
         # Track counters
         self.metrics.increment_counter('transactions_processed_total', 1, labels)
-        if status in ['matched', 'partially_matched']:
+        if successful:
             self.metrics.increment_counter('transactions_successful_total', 1, labels)
         
         # Track processing time
-        self.metrics.record_histogram('transaction_processing_time_ms', processing_time_ms, labels)
+        self.metrics.record_histogram('transaction_processing_time_ms', processing_time_ms, histogram_labels)
         
         # Track amount
-        self.metrics.record_histogram('transaction_amount', amount, labels)
-        
-        # Store business event
-        self.business_events.append({
-            'type': 'transaction_processed',
-            'transaction_id': transaction_id,
-            'amount': amount,
-            'currency': currency,
-            'status': status,
-            'processing_time_ms': processing_time_ms,
-            'client_id': client_id,
-            'timestamp': datetime.now(timezone.utc).isoformat()
-        })
+        self.metrics.record_histogram('transaction_amount', amount, histogram_labels)
+        
+        # Fold into the per-minute aggregates read by get_business_summary
+        self._record_transaction(time.time(), amount, currency, processing_time_ms, successful, client_id)
     
     def track_erp_operation(self, 
                            operation_type: str,
@@ -528,10 +1129,15 @@ class BusinessMetricsTracker:
             'document_count': str(document_count)
         }
         
-        self.metrics.increment_counter('documents_processed_total', document_count, labels)
-        self.metrics.record_histogram('document_processing_time_ms', processing_time_ms, labels)
-        self.metrics.record_histogram('invoice_ids_extracted', invoice_ids_found, labels)
-        self.metrics.record_histogram('document_confidence_score', confidence_score, labels)
+        self.metrics.record_batch(
+            labels,
+            counters={'documents_processed_total': document_count},
+            histograms={
+                'document_processing_time_ms': processing_time_ms,
+                'invoice_ids_extracted': invoice_ids_found,
+                'document_confidence_score': confidence_score
+            }
+        )
     
     def track_communication_sent(self, 
                                 comm_type: str,
@@ -549,34 +1155,37 @@ class BusinessMetricsTracker:
             self.metrics.increment_counter('communication_failures_total', 1, labels)
     
     def get_business_summary(self, hours: int = 24) -> Dict[str, Any]:
-        """Get business metrics summary for specified period"""
-        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
-        
-        # Filter events by time period
-        recent_events = [
-            event for event in self.business_events
-            if datetime.fromisoformat(event['timestamp']) > cutoff_time
-        ]
+        """
+        Get business metrics summary for specified period
         
-        # Calculate summary statistics
-        transaction_events = [e for e in recent_events if e['type'] == 'transaction_processed']
+        The period is counted in whole minutes, starting at the minute
+        containing the cutoff; at most BUSINESS_SUMMARY_RETENTION_HOURS back.
+        """
+        cutoff_minute = int((time.time() - hours * 3600) // 60)
         
-        if not transaction_events:
-            return {'period_hours': hours, 'no_data': True}
+        total_transactions = 0
+        successful_transactions = 0
+        total_amount = 0.0
+        total_processing_time = 0.0
+        by_currency = {}
+        clients = set()
         
-        total_transactions = len(transaction_events)
-        successful_transactions = len([e for e in transaction_events if e['status'] in ['matched', 'partially_matched']])
-        total_amount = sum(e['amount'] for e in transaction_events)
-        avg_processing_time = sum(e['processing_time_ms'] for e in transaction_events) / total_transactions
+        for minute in reversed(self._buckets):
+            if minute < cutoff_minute:
+                break
+            bucket = self._buckets[minute]
+            total_transactions += bucket['count']
+            successful_transactions += bucket['successful']
+            total_amount += bucket['amount']
+            total_processing_time += bucket['processing_time_ms']
+            for currency, (count, amount) in bucket['by_currency'].items():
+                currency_summary = by_currency.setdefault(currency, {'count': 0, 'amount': 0.0})
+                currency_summary['count'] += count
+                currency_summary['amount'] += amount
+            clients |= bucket['clients']
         
-        # Group by currency
-        by_currency = {}
-        for event in transaction_events:
-            currency = event['currency']
-            if currency not in by_currency:
-                by_currency[currency] = {'count': 0, 'amount': 0}
-            by_currency[currency]['count'] += 1
-            by_currency[currency]['amount'] += event['amount']
+        if not total_transactions:
+            return {'period_hours': hours, 'no_data': True}
         
         return {
             'period_hours': hours,
@@ -584,9 +1193,9 @@ class BusinessMetricsTracker:
             'successful_transactions': successful_transactions,
             'success_rate': successful_transactions / total_transactions,
             'total_amount_processed': total_amount,
-            'average_processing_time_ms': avg_processing_time,
+            'average_processing_time_ms': total_processing_time / total_transactions,
             'by_currency': by_currency,
-            'clients_active': len(set(e.get('client_id') for e in transaction_events if e.get('client_id')))
+            'clients_active': len(clients)
         }
 
 class AlertManager:
@@ -601,221 +1210,327 @@ class AlertManager:
         self.metrics = metrics_collector
         self.health_checker = health_checker
         self.alert_rules = {}
-        self.alert_history = []
+        self.alert_history = deque(maxlen=ALERT_HISTORY_MAX)
         self.suppression_cache = {}  # Prevent alert spam
+        self._rule_results = {}  # rule name -> (pass evaluated in, should_alert)
+        self._passes = 0  # check_alerts calls so far
     
     def add_alert_rule(self, 
                       name: str,
-                      condition: Callable[[Dict[str, Any]], bool],
+                      condition: Union[Callable[[Dict[str, Any]], bool], List[Callable[[Dict[str, Any]], bool]]],
                       severity: str = "warning",
-                      cooldown_minutes: int = 15):
+                      cooldown_minutes: int = 15,
+                      eval_every: int = 1):
         """
         Add alert rule
         
         Args:
             name: Alert rule name
-            condition: Function that returns True when alert should fire
+            condition: Function that returns True when alert should fire, or a
+                list of them that must all hold; the list is evaluated cheapest
+                first and stops at the first False
             severity: Alert severity (info, warning, error, critical)
             cooldown_minutes: Minimum time between same alerts
+            eval_every: Evaluate the condition on every Nth check_alerts pass
+                and reuse its outcome in between; for conditions over slowly
+                changing inputs, so the saving follows the monitoring cadence
         """
+        if eval_every < 1:
+            raise ValueError(f"eval_every must be at least 1: {eval_every!r}")
+        if isinstance(condition, (list, tuple)):
+            # [mean cost in ns, predicate] pairs, kept sorted by cost
+            condition = partial(self._all_predicates, [[0.0, p] for p in condition])
+        
         self.alert_rules[name] = {
             'condition': condition,
             'severity': severity,
-            'cooldown_minutes': cooldown_minutes
+            'cooldown_minutes': cooldown_minutes,
+            'eval_every': eval_every
         }
-        logger.info(f"Added alert rule: {name}")
+        self._rule_results.pop(name, None)
+        logger.info("Added alert rule: %s", name)
+    
+    def add_threshold_rule(self,
+                           name: str,
+                           key: str,
+                           op: str,
+                           threshold: Union[float, str],
+                           severity: str = "warning",
+                           cooldown_minutes: int = 15):
+        """
+        Add alert rule that fires when context[key] <op> threshold
+        
+        The condition is generated with key and threshold as constants, so
+        evaluating it is one lookup and one comparison.
+        """
+        if op not in _THRESHOLD_OPS:
+            raise ValueError(f"Unsupported alert comparison: {op!r}")
+        if not isinstance(key, str):
+            raise ValueError(f"Alert context key must be a string: {key!r}")
+        if not isinstance(threshold, str):
+            threshold = float(threshold)
+            # repr() of nan/inf isn't a valid literal in the generated source
+            if not math.isfinite(threshold):
+                raise ValueError(f"Alert threshold must be finite: {threshold!r}")
+        
+        namespace = {}
+        exec(f"def condition(c): return c[{key!r}] {op} {threshold!r}", namespace)
+        self.add_alert_rule(name, namespace['condition'], severity, cooldown_minutes)
+    
+    @staticmethod
+    def _all_predicates(predicates: List[list], context: Dict[str, Any]) -> bool:
+        """Evaluate a composite condition, short-circuiting on the first False"""
+        result = True
+        for entry in predicates:
+            start = time.perf_counter_ns()
+            holds = entry[1](context)
+            # Exponentially weighted mean cost, used to order the next evaluation
+            entry[0] += 0.2 * ((time.perf_counter_ns() - start) - entry[0])
+            if not holds:
+                result = False
+                break
+        
+        predicates.sort(key=itemgetter(0))
+        return result
     
-    async def check_alerts(self) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _build_context(metrics_summary: Dict[str, Any], health_summary: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the context passed to alert conditions
+        
+        Besides the raw 'metrics' and 'health' summaries, the values the default
+        rules need are extracted once here as flat keys.
+        """
+        summary = health_summary.get('summary', {})
+        system = health_summary.get('system_info', {}).get('system', {})
+        db_check = health_summary.get('checks', {}).get('database', {})
+        histograms = metrics_summary.get('histograms', {})
+        
+        return {
+            'metrics': metrics_summary,
+            'health': health_summary,
+            'timestamp': time.time(),
+            'unhealthy_checks': summary.get('unhealthy_checks', 0),
+            'total_checks': summary.get('total_checks', 1),
+            'database_status': db_check.get('status'),
+            'memory_percent': system.get('memory_percent', 0),
+            'max_processing_time_p95': max(
+                (stats.get('p95', 0) for key, stats in histograms.items() if 'processing_time' in key),
+                default=0
+            )
+        }
+    
+    async def _current_context(self, max_health_age_seconds: float) -> Dict[str, Any]:
+        """Gather current metrics and health status into an alert context"""
+        try:
+            metrics_summary = self.metrics.get_metrics_summary()
+            health_summary = await self.health_checker.get_recent_health(max_health_age_seconds)
+        except Exception as e:
+            raise CashAppException("Alert context unavailable", "ALERT_CONTEXT_ERROR", cause=e) from e
+        return self._build_context(metrics_summary, health_summary)
+    
+    async def check_alerts(self, max_health_age_seconds: float = ALERT_HEALTH_MAX_AGE_SECONDS) -> List[Dict[str, Any]]:
         """
         Check all alert rules and fire alerts if conditions met
         
+        A failing rule is logged and skipped; failing to gather metrics or
+        health raises, so the monitoring loop can back off.
+        
+        Args:
+            max_health_age_seconds: Reuse the last health summary if it is at
+                most this old instead of running every health check again
+        
         Returns:
             List of fired alerts
+        
+        Raises:
+            CashAppException: ALERT_CONTEXT_ERROR if the alert context can't be built
         """
-        try:
-            # Get current metrics and health status
-            metrics_summary = self.metrics.get_metrics_summary()
-            health_summary = await self.health_checker.run_all_checks()
-            
-            context = {
-                'metrics': metrics_summary,
-                'health': health_summary,
-                'timestamp': time.time()
-            }
-            
-            fired_alerts = []
-            
-            # Check each alert rule
-            for rule_name, rule in self.alert_rules.items():
+        now = time.time()
+        self._passes += 1
+        current_pass = self._passes
+        context = None
+        fired_alerts = []
+        
+        # Check each alert rule
+        for rule_name, rule in self.alert_rules.items():
+            # Reuse a recent outcome; metrics and health are only gathered
+            # once some rule actually needs evaluating
+            cached = self._rule_results.get(rule_name)
+            if cached is not None and current_pass - cached[0] < rule['eval_every']:
+                should_alert = cached[1]
+            else:
+                if context is None:
+                    context = await self._current_context(max_health_age_seconds)
                 try:
-                    # Check if alert should fire
                     should_alert = rule['condition'](context)
-                    
-                    if should_alert:
-                        # Check cooldown
-                        last_fired = self.suppression_cache.get(rule_name, 0)
-                        cooldown_seconds = rule['cooldown_minutes'] * 60
-                        
-                        if time.time() - last_fired > cooldown_seconds:
-                            # Fire alert
-                            alert = {
-                                'rule_name': rule_name,
-                                'severity': rule['severity'],
-                                'timestamp': datetime.now(timezone.utc).isoformat(),
-                                'context': context,
-                                'service': self.metrics.service_name
-                            }
-                            
-                            fired_alerts.append(alert)
-                            self.alert_history.append(alert)
-                            self.suppression_cache[rule_name] = time.time()
-                            
-                            logger.warning(f"Alert fired: {rule_name}", extra={
-                                'severity': rule['severity'],
-                                'service': self.metrics.service_name
-                            })
-                
                 except Exception as e:
-                    logger.error(f"Alert rule {rule_name} failed: {e}")
+                    logger.error("Alert rule %s failed: %s", rule_name, e)
+                    continue
+                self._rule_results[rule_name] = (current_pass, should_alert)
             
-            return fired_alerts
+            if not should_alert:
+                continue
             
-        except Exception as e:
-            logger.error(f"Alert checking failed: {e}")
-            return []
+            # Check cooldown
+            last_fired = self.suppression_cache.get(rule_name, 0)
+            cooldown_seconds = rule['cooldown_minutes'] * 60
+            if now - last_fired <= cooldown_seconds:
+                continue
+            
+            if context is None:
+                context = await self._current_context(max_health_age_seconds)
+            
+            # Fire alert
+            alert = {
+                'rule_name': rule_name,
+                'severity': rule['severity'],
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'context': context,
+                'service': self.metrics.service_name
+            }
+            
+            fired_alerts.append(alert)
+            self.alert_history.append(alert)
+            self.suppression_cache[rule_name] = now
+            
+            logger.warning("Alert fired: %s", rule_name, extra={
+                'severity': rule['severity'],
+                'service': self.metrics.service_name
+            })
+        
+        return fired_alerts
     
     def add_default_alert_rules(self):
         """Add standard alert rules for CashAppAgent"""
         
-        # High error rate alert
-        def high_error_rate(context):
-            health = context.get('health', {})
-            unhealthy_checks = health.get('summary', {}).get('unhealthy_checks', 0)
-            total_checks = health.get('summary', {}).get('total_checks', 1)
-            return unhealthy_checks / total_checks > 0.2  # 20% failure rate
-        
-        self.add_alert_rule('high_error_rate', high_error_rate, 'error', 10)
+        # High error rate alert: 20% failure rate
+        self.add_alert_rule(
+            'high_error_rate',
+            lambda c: c['unhealthy_checks'] / c['total_checks'] > 0.2,
+            'error', 10
+        )
         
         # Database connectivity alert
-        def database_down(context):
-            health = context.get('health', {})
-            db_check = health.get('checks', {}).get('database', {})
-            return db_check.get('status') == 'unhealthy'
-        
-        self.add_alert_rule('database_down', database_down, 'critical', 5)
-        
-        # High processing time alert
-        def slow_processing(context):
-            metrics = context.get('metrics', {})
-            histograms = metrics.get('histograms', {})
-            processing_time_metrics = {k: v for k, v in histograms.items() if 'processing_time' in k}
-            
-            for metric_name, stats in processing_time_metrics.items():
-                if stats.get('p95', 0) > 30000:  # 30 seconds
-                    return True
-            return False
+        self.add_threshold_rule('database_down', 'database_status', '==', 'unhealthy', 'critical', 5)
         
-        self.add_alert_rule('slow_processing', slow_processing, 'warning', 30)
+        # High processing time alert: any processing_time p95 above 30 seconds
+        self.add_threshold_rule('slow_processing', 'max_processing_time_p95', '>', 30000, 'warning', 30)
         
         # Memory usage alert
-        def high_memory_usage(context):
-            health = context.get('health', {})
-            system_info = health.get('system_info', {})
-            memory_percent = system_info.get('system', {}).get('memory_percent', 0)
-            return memory_percent > 85
-        
-        self.add_alert_rule('high_memory_usage', high_memory_usage, 'warning', 15)
+        self.add_threshold_rule('high_memory_usage', 'memory_percent', '>', 85, 'warning', 15)
 
 # Standard health check functions
-async def check_database_health(connection_string: str) -> Dict[str, Any]:
-    """Check database connectivity and performance"""
-    try:
-        from .database import DatabaseManager
-        
-        db_manager = DatabaseManager(connection_string)
-        await db_manager.initialize()
-        
-        # Test basic query
-        start_time = time.time()
-        result = await db_manager.execute_query("SELECT 1")
-        query_time = int((time.time() - start_time) * 1000)
-        
-        await db_manager.close()
-        
-        return {
-            'status': 'healthy',
-            'response_time_ms': query_time,
-            'details': {
-                'query_result': result,
-                'connection_test': 'passed'
-            }
-        }
+async def check_database_health(db: Union[str, 'DatabaseManager']) -> ProbeResult:
+    """
+    Check database connectivity and performance
+    
+    Args:
+        db: The service's initialized DatabaseManager, whose pool is borrowed
+            for the probe, or a connection string for the shared probe pool
+    
+    Register with a bound manager, e.g.
+    add_simple_check('database', partial(check_database_health, db_manager))
+    """
+    if isinstance(db, str):
+        # Same pooled asyncpg probe as shared.health, reported in monitoring's shape
+        from .health import check_database_connection
         
-    except Exception as e:
-        return {
-            'status': 'unhealthy',
-            'message': str(e),
-            'details': {'error_type': type(e).__name__}
-        }
+        result = await check_database_connection(db)
+        if result['status'] != _HEALTHY:
+            return ProbeResult(_UNHEALTHY, result.get('error'), {'error_type': result.get('error_type')})
+        response_time = result['response_time_ms']
+    else:
+        start_time = time.monotonic_ns()
+        try:
+            async with db.get_connection(timeout=5.0) as connection:
+                await connection.fetchval('SELECT 1')
+        except Exception as e:
+            return ProbeResult(_UNHEALTHY, str(e), {'error_type': type(e).__name__})
+        response_time = (time.monotonic_ns() - start_time) // 1_000_000
+    
+    return ProbeResult(_HEALTHY, details={'connection_test': 'passed'}, response_time_ms=response_time)
 
-async def check_service_health(service_url: str, timeout: int = 10) -> Dict[str, Any]:
-    """Check external service health"""
+async def check_service_health(service_url: str, timeout: int = 10, client=None) -> ProbeResult:
+    """
+    Check external service health
+    
+    Args:
+        service_url: Base URL of the service
+        timeout: Request timeout in seconds
+        client: httpx.AsyncClient to probe with; defaults to the pooled
+            keep-alive client shared with shared.health's HTTP probes
+    """
     try:
-        import httpx
+        if client is None:
+            from .health import get_http_client
+            client = get_http_client()
+        
+        start_time = time.monotonic_ns()
+        response = await client.get(f"{service_url}/health", timeout=timeout)
+        response_time = (time.monotonic_ns() - start_time) // 1_000_000
         
-        start_time = time.time()
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{service_url}/health", timeout=timeout)
-            response_time = int((time.time() - start_time) * 1000)
+        if response.status_code == 200:
+            return ProbeResult(
+                _HEALTHY,
+                details=response.json() if response.content else {},
+                response_time_ms=response_time
+            )
+        else:
+            return ProbeResult(
+                _UNHEALTHY,
+                f"HTTP {response.status_code}",
+                {'status_code': response.status_code},
+                response_time
+            )
             
-            if response.status_code == 200:
-                return {
-                    'status': 'healthy',
-                    'response_time_ms': response_time,
-                    'details': response.json() if response.content else {}
-                }
-            else:
-                return {
-                    'status': 'unhealthy',
-                    'response_time_ms': response_time,
-                    'message': f"HTTP {response.status_code}",
-                    'details': {'status_code': response.status_code}
-                }
-                
     except Exception as e:
-        return {
-            'status': 'unhealthy',
-            'message': str(e),
-            'details': {'error_type': type(e).__name__}
-        }
+        return ProbeResult(_UNHEALTHY, str(e), {'error_type': type(e).__name__})
 
-async def check_azure_service_health(service_name: str, endpoint: str = None) -> Dict[str, Any]:
+@lru_cache(maxsize=256)
+def _azure_placeholder_result(service_name: str, endpoint: Optional[str]) -> ProbeResult:
+    """Placeholder result per service; shared between calls, so treat it as read-only"""
+    return ProbeResult(
+        _HEALTHY,
+        f"{service_name} connectivity verified",
+        {'service': service_name, 'endpoint': endpoint}
+    )
+
+async def check_azure_service_health(service_name: str, endpoint: str = None) -> ProbeResult:
     """Check Azure service health"""
     try:
         # This would check specific Azure services
         # For now, return a placeholder
-        return {
-            'status': 'healthy',
-            'message': f"{service_name} connectivity verified",
-            'details': {
-                'service': service_name,
-                'endpoint': endpoint
-            }
-        }
+        return _azure_placeholder_result(service_name, endpoint)
         
     except Exception as e:
-        return {
-            'status': 'unhealthy',
-            'message': str(e),
-            'details': {'service': service_name}
-        }
+        return ProbeResult(_UNHEALTHY, str(e), {'service': service_name})
 
 # Global monitoring instances
-_app_insights = None
-_health_checker = None
-_metrics_collector = None
-_business_tracker = None
-_alert_manager = None
+@dataclass(slots=True, frozen=True)
+class MonitoringContext:
+    """The monitoring components of one service, created together"""
+    app_insights: ApplicationInsights
+    health_checker: ComprehensiveHealthChecker
+    metrics_collector: MetricsCollector
+    business_tracker: BusinessMetricsTracker
+    alert_manager: AlertManager
+
+_ctx: Optional[MonitoringContext] = None
+
+# Set by stop_monitoring_loop to end a running start_monitoring_loop
+_shutdown: Optional[asyncio.Event] = None
+
+# (context, alert rule count, body) of the last serialized monitoring health
+# response without service probes; the body only changes with those two
+_health_response_cache: Optional[tuple] = None
+
+_UNINITIALIZED_COMPONENTS = {
+    'health_checker': 'not_initialized',
+    'metrics_collector': 'not_initialized',
+    'application_insights': 'disabled',
+    'alert_manager': 'not_initialized'
+}
 
 def initialize_monitoring(service_name: str, 
                          app_insights_key: str = None) -> tuple:
@@ -829,104 +1544,240 @@ def initialize_monitoring(service_name: str,
     Returns:
         Tuple of (health_checker, metrics_collector, business_tracker)
     """
-    global _app_insights, _health_checker, _metrics_collector, _business_tracker, _alert_manager
-    
-    # Initialize Application Insights
-    _app_insights = ApplicationInsights(app_insights_key)
-    
-    # Initialize health checker
-    _health_checker = ComprehensiveHealthChecker(service_name)
+    global _ctx
     
-    # Initialize metrics collector
-    _metrics_collector = MetricsCollector(service_name, _app_insights)
+    app_insights = ApplicationInsights(app_insights_key)
+    health_checker = ComprehensiveHealthChecker(service_name)
+    metrics_collector = MetricsCollector(service_name, app_insights)
+    business_tracker = BusinessMetricsTracker(metrics_collector)
     
-    # Initialize business tracker
-    _business_tracker = BusinessMetricsTracker(_metrics_collector)
+    alert_manager = AlertManager(metrics_collector, health_checker)
+    alert_manager.add_default_alert_rules()
     
-    # Initialize alert manager
-    _alert_manager = AlertManager(_metrics_collector, _health_checker)
-    _alert_manager.add_default_alert_rules()
+    _ctx = MonitoringContext(
+        app_insights=app_insights,
+        health_checker=health_checker,
+        metrics_collector=metrics_collector,
+        business_tracker=business_tracker,
+        alert_manager=alert_manager
+    )
     
-    logger.info(f"Monitoring system initialized for {service_name}")
+    logger.info("Monitoring system initialized for %s", service_name)
     
-    return _health_checker, _metrics_collector, _business_tracker
+    return health_checker, metrics_collector, business_tracker
+
+def get_monitoring_context() -> MonitoringContext:
+    """Get the initialized monitoring context"""
+    ctx = _ctx
+    if ctx is None:
+        raise CashAppException("Monitoring not initialized", "MONITORING_NOT_INITIALIZED")
+    return ctx
 
 def get_monitoring_components() -> tuple:
     """Get initialized monitoring components"""
-    if not _health_checker:
-        raise CashAppException("Monitoring not initialized", "MONITORING_NOT_INITIALIZED")
-    
-    return _health_checker, _metrics_collector, _business_tracker, _alert_manager
+    ctx = get_monitoring_context()
+    return ctx.health_checker, ctx.metrics_collector, ctx.business_tracker, ctx.alert_manager
 
 # Background monitoring task
 async def start_monitoring_loop(interval_seconds: int = 60):
     """
     Start background monitoring loop
     
+    A ticker, an alert checker and a telemetry flusher run as separate tasks
+    joined by small queues, so a slow flush never delays the next alert check.
+    Runs until stop_monitoring_loop() is called, then stops the components'
+    background tasks, forwards and flushes the remaining telemetry and closes
+    the shared telemetry client before returning.
+    
     Args:
         interval_seconds: Monitoring interval
     """
-    if not _alert_manager:
+    global _shutdown
+    
+    ctx = _ctx
+    if ctx is None:
         logger.warning("Alert manager not initialized, skipping monitoring loop")
         return
     
-    logger.info(f"Starting monitoring loop with {interval_seconds}s interval")
+    shutdown = _shutdown = asyncio.Event()
     
-    while True:
-        try:
-            # Check alerts
-            fired_alerts = await _alert_manager.check_alerts()
-            
-            if fired_alerts:
-                logger.info(f"Monitoring cycle completed: {len(fired_alerts)} alerts fired")
-            
-            # Flush Application Insights telemetry
-            if _app_insights:
-                await _app_insights.flush()
-            
-            await asyncio.sleep(interval_seconds)
+    logger.info("Starting monitoring loop with %ss interval", interval_seconds)
+    
+    # A tick that finds the checker two behind is dropped; flush requests
+    # made while one is already pending collapse into it
+    tick_queue = asyncio.Queue(maxsize=2)
+    flush_queue = asyncio.Queue(maxsize=1)
+    
+    async def ticker():
+        # Ticks are scheduled against fixed deadlines so cycle time doesn't drift
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        
+        while True:
+            try:
+                tick_queue.put_nowait(deadline)
+            except asyncio.QueueFull:
+                logger.warning("Alert checker is behind, skipping monitoring tick")
             
-        except Exception as e:
-            logger.error(f"Monitoring loop error: {e}")
-            await asyncio.sleep(interval_seconds)
+            deadline += interval_seconds
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                # Overran the tick: just yield, and skip ticks missed entirely
+                # rather than running them back to back
+                if delay <= -interval_seconds:
+                    deadline = loop.time()
+                await asyncio.sleep(0)
+    
+    async def alert_worker():
+        consecutive_failures = 0
+        while True:
+            await tick_queue.get()
+            try:
+                fired_alerts = await ctx.alert_manager.check_alerts()
+                
+                if fired_alerts:
+                    logger.info("Monitoring cycle completed: %d alerts fired", len(fired_alerts))
+                
+                # Hand metrics to Application Insights; its flusher exports them
+                # by batch size or age, except that critical alerts go out now
+                ctx.metrics_collector.forward_pending()
+                if not ctx.app_insights.immediate and any(
+                    alert['severity'] == 'critical' for alert in fired_alerts
+                ):
+                    try:
+                        flush_queue.put_nowait(True)
+                    except asyncio.QueueFull:
+                        pass
+                
+                consecutive_failures = 0
+                
+            except Exception as e:
+                logger.error("Monitoring loop error: %s", e)
+                
+                # Capped exponential backoff with jitter, so replicas hitting the
+                # same outage don't retry in lockstep; ticks queued meanwhile are stale
+                delay = min(interval_seconds * 2 ** consecutive_failures, MONITORING_MAX_BACKOFF_SECONDS)
+                consecutive_failures += 1
+                await asyncio.sleep(delay + random.uniform(0, interval_seconds))
+                while not tick_queue.empty():
+                    tick_queue.get_nowait()
+    
+    async def flush_worker():
+        while True:
+            await flush_queue.get()
+            try:
+                await asyncio.wait_for(ctx.app_insights.flush(), TELEMETRY_FLUSH_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning("Telemetry flush timed out; unsent items stay buffered")
+            except Exception as e:
+                logger.error("Monitoring loop error: %s", e)
+    
+    workers = [
+        asyncio.create_task(ticker()),
+        asyncio.create_task(alert_worker()),
+        asyncio.create_task(flush_worker())
+    ]
+    try:
+        await shutdown.wait()
+    finally:
+        # Also reached when this task is cancelled; the workers stop at once
+        # instead of finishing a sleep or backoff
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+    
+    logger.info("Monitoring loop stopped, flushing telemetry")
+    await ctx.health_checker.aclose()
+    # Pending metrics are handed over before the flusher stops, and the final
+    # flush only starts once it has
+    await ctx.metrics_collector.aclose()
+    await ctx.app_insights.aclose()
+    try:
+        await asyncio.wait_for(ctx.app_insights.flush(), TELEMETRY_FLUSH_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.warning("Telemetry flush timed out during shutdown")
+    except Exception as e:
+        logger.error("Monitoring loop error: %s", e)
+    finally:
+        await close_telemetry_client()
+
+def stop_monitoring_loop():
+    """Ask a running start_monitoring_loop to flush telemetry and return"""
+    if _shutdown is not None:
+        _shutdown.set()
 
-async def monitoring_health_check() -> Dict[str, Any]:
-    """Check monitoring system health"""
+async def monitoring_health_check(services: Dict[str, str] = None,
+                                  probe_timeout: float = 2.0) -> Dict[str, Any]:
+    """
+    Check monitoring system health
+    
+    Args:
+        services: Optional Azure service name -> endpoint map; the services are
+            probed concurrently and reported alongside the components
+        probe_timeout: Per-probe time limit in seconds
+    """
     try:
-        components = {}
-        
-        if _health_checker:
-            components['health_checker'] = 'initialized'
-        else:
-            components['health_checker'] = 'not_initialized'
-        
-        if _metrics_collector:
-            components['metrics_collector'] = 'initialized'
+        # initialize_monitoring creates every component at once, so the
+        # context being set is the whole initialization state
+        ctx = _ctx
+        degraded = ctx is None
+        if degraded:
+            components = dict(_UNINITIALIZED_COMPONENTS)
         else:
-            components['metrics_collector'] = 'not_initialized'
-        
-        if _app_insights and _app_insights.enabled:
-            components['application_insights'] = 'enabled'
-        else:
-            components['application_insights'] = 'disabled'
-        
-        if _alert_manager:
-            components['alert_manager'] = f"initialized_with_{len(_alert_manager.alert_rules)}_rules"
-        else:
-            components['alert_manager'] = 'not_initialized'
+            components = {
+                'health_checker': 'initialized',
+                'metrics_collector': 'initialized',
+                'application_insights': 'enabled' if ctx.app_insights.enabled else 'disabled',
+                'alert_manager': f"initialized_with_{len(ctx.alert_manager.alert_rules)}_rules"
+            }
         
-        overall_status = 'healthy' if all(
-            status != 'not_initialized' for status in components.values()
-        ) else 'degraded'
+        if services:
+            probes = [
+                asyncio.wait_for(check_azure_service_health(name, endpoint), probe_timeout)
+                for name, endpoint in services.items()
+            ]
+            results = await asyncio.gather(*probes, return_exceptions=True)
+            for name, result in zip(services, results):
+                status = _UNHEALTHY if isinstance(result, BaseException) else result.status
+                components[name] = status
+                if status == _UNHEALTHY:
+                    degraded = True
         
         return {
-            'status': overall_status,
+            'status': 'degraded' if degraded else 'healthy',
             'components': components
         }
         
     except Exception as e:
-        logger.error(f"Monitoring health check failed: {e}")
+        logger.error("Monitoring health check failed: %s", e)
         return {
             'status': 'unhealthy',
             'error': str(e)
-        }
\ No newline at end of file
+        }
+
+async def monitoring_health_check_json(services: Dict[str, str] = None,
+                                       probe_timeout: float = 2.0) -> bytes:
+    """
+    monitoring_health_check serialized as JSON, for returning as a raw response
+    
+    Without service probes the body is reused until monitoring is
+    (re)initialized or the alert rules change.
+    """
+    global _health_response_cache
+    
+    if services:
+        return _dumps_json(await monitoring_health_check(services, probe_timeout))
+    
+    ctx = _ctx
+    rule_count = len(ctx.alert_manager.alert_rules) if ctx is not None else 0
+    cached = _health_response_cache
+    if cached is not None and cached[0] is ctx and cached[1] == rule_count:
+        return cached[2]
+    
+    result = await monitoring_health_check()
+    body = _dumps_json(result)
+    if 'error' not in result:
+        _health_response_cache = (ctx, rule_count, body)
+    return body
\ No newline at end of file
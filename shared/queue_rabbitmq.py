@@ -17,11 +17,16 @@ from kombu.exceptions import ConnectionError, ChannelError
 import backoff
 
 from .logging import setup_logging
-from .exception import CashAppException
+from .exceptions import CashAppException
 from .models import PaymentTransaction, MatchResult
 
 logger = setup_logging("queue_rabbitmq")
 
+# Message dispositions returned by RabbitMQManager._process_message_wrapper
+DISPOSITION_ACK = 'ack'
+DISPOSITION_REJECT = 'reject'
+DISPOSITION_REQUEUE = 'requeue'
+
 @dataclass
 class QueueMessage:
     """Standard message format for queue operations"""
@@ -324,14 +329,15 @@ class RabbitMQManager:
                 
                 queue = self.queues[queue_name]
                 
-                # Define message callback
+                # Processing tasks not yet settled, by delivery tag
+                in_flight: Dict[int, asyncio.Task] = {}
+                # Deliveries received by the drain thread, picked up by the loop
+                received: List[tuple] = []
+                
+                # Define message callback; runs on the drain thread, so it
+                # only records the delivery
                 def on_message(body, message):
-                    try:
-                        # Process message asynchronously
-                        asyncio.create_task(self._process_message_wrapper(body, message))
-                    except Exception as e:
-                        logger.error(f"Error creating message processing task: {e}")
-                        message.reject(requeue=True)
+                    received.append((body, message))
                 
                 # Start consuming
                 consumer = Consumer(
@@ -349,23 +355,92 @@ class RabbitMQManager:
                 with consumer:
                     while True:
                         try:
-                            self.connection.drain_events(timeout=1)
+                            # Blocking socket read, kept off the event loop so
+                            # processing tasks run while waiting; the channel is
+                            # only used from the loop once the drain returns
+                            await asyncio.to_thread(
+                                self.connection.drain_events,
+                                timeout=0.05 if in_flight else 1
+                            )
                         except Exception as e:
                             if "timed out" not in str(e).lower():
                                 logger.error(f"Error draining events: {e}")
                                 await asyncio.sleep(5)
+                        
+                        for body, message in received:
+                            try:
+                                # Process message asynchronously; the result is
+                                # settled below once the task finishes
+                                in_flight[message.delivery_tag] = asyncio.create_task(
+                                    self._process_message_wrapper(body, message)
+                                )
+                            except Exception as e:
+                                logger.error(f"Error creating message processing task: {e}")
+                                message.reject(requeue=True)
+                        received.clear()
+                        
+                        if in_flight:
+                            self._settle_completed(channel, in_flight)
                                 
         except Exception as e:
             logger.error(f"Failed to start message processor: {e}")
             raise CashAppException(f"Message processor failed: {e}", "QUEUE_PROCESSOR_ERROR")
     
+    def _settle_completed(self, channel, in_flight: Dict[int, asyncio.Task]):
+        """
+        Settle the messages whose processing has finished
+        
+        Acks for a run of finished messages below the oldest unfinished or
+        rejected delivery go out as one multiple-ack; the rest are settled
+        individually.
+        """
+        done = [tag for tag, task in in_flight.items() if task.done()]
+        if not done:
+            return
+        
+        dispositions = {}
+        for tag in done:
+            task = in_flight.pop(tag)
+            if task.cancelled() or task.exception() is not None:
+                dispositions[tag] = (DISPOSITION_REQUEUE, None)
+            else:
+                dispositions[tag] = task.result()
+        
+        # Acks below every unsettled or non-ack delivery can be cumulative
+        blocking_tags = [tag for tag, (disposition, _) in dispositions.items() if disposition != DISPOSITION_ACK]
+        blocking_tags.extend(in_flight)
+        ack_below = min(blocking_tags, default=None)
+        
+        cumulative_ack = None
+        for tag in sorted(dispositions):
+            disposition, message = dispositions[tag]
+            if disposition == DISPOSITION_ACK:
+                if ack_below is None or tag < ack_below:
+                    cumulative_ack = tag
+                else:
+                    message.ack()
+            elif disposition == DISPOSITION_REJECT:
+                message.reject(requeue=False)
+            elif message is not None:
+                message.reject(requeue=True)
+            else:
+                channel.basic_reject(tag, requeue=True)
+        
+        if cumulative_ack is not None:
+            channel.basic_ack(cumulative_ack, multiple=True)
+    
     async def _process_message_wrapper(self, body, message):
-        """Wrapper to handle message processing in async context"""
+        """
+        Wrapper to handle message processing in async context
+        
+        Returns:
+            (disposition, message); the consume loop settles the message
+        """
         try:
             result = await self._process_message(body, message)
             
             if result.success:
-                message.ack()
+                return DISPOSITION_ACK, message
             else:
                 # Check if we should retry
                 headers = message.headers or {}
@@ -382,14 +457,14 @@ class RabbitMQManager:
                     queue_message.retry_count = retry_count + 1
                     
                     await self.send_message('retry', queue_message, delay_seconds=delay_seconds)
-                    message.ack()  # Ack original message
+                    return DISPOSITION_ACK, message  # Ack original message
                 else:
                     # Send to dead letter queue
-                    message.reject(requeue=False)
+                    return DISPOSITION_REJECT, message
                     
         except Exception as e:
             logger.error(f"Message processing wrapper error: {e}")
-            message.reject(requeue=True)
+            return DISPOSITION_REQUEUE, message
     
     async def _process_message(self, body, message) -> ProcessingResult:
         """
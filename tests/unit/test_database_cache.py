@@ -0,0 +1,193 @@
+# tests/unit/test_database_cache.py
+"""
+Unit tests for DatabaseManager's Redis result cache
+Runs against in-memory stand-ins for the asyncpg pool and the Redis client
+"""
+
+import pytest
+from datetime import datetime, date, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from shared.database import DatabaseManager, _normalize_table, _referenced_tables, _READ_TABLES_RE, _WRITE_TABLES_RE
+
+
+class FakeConnection:
+    """Records statements and answers fetch() with the configured rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.fetches = []
+        self.executed = []
+
+    async def fetch(self, query, *args):
+        self.fetches.append((query, args))
+        return self.rows
+
+    async def execute(self, command, *args):
+        self.executed.append((command, args))
+        return "UPDATE 1"
+
+
+class FakePool:
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def acquire(self, timeout=None):
+        return self.connection
+
+    async def release(self, connection):
+        pass
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def setex(self, key, ttl, value):
+        self.ops.append(lambda: self.redis.strings.__setitem__(key, value))
+
+    def sadd(self, key, member):
+        self.ops.append(lambda: self.redis.sets.setdefault(key, set()).add(member))
+
+    def expire(self, key, ttl):
+        pass
+
+    async def execute(self):
+        for op in self.ops:
+            op()
+
+
+class FakeRedis:
+    """The subset of redis.asyncio.Redis the result cache uses"""
+
+    def __init__(self):
+        self.strings = {}
+        self.sets = {}
+
+    async def get(self, key):
+        return self.strings.get(key)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    async def sunion(self, *keys):
+        return set().union(*(self.sets.get(key, set()) for key in keys))
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.strings.pop(key, None)
+            self.sets.pop(key, None)
+
+
+ROWS = [{
+    'invoice_id': 'INV-1',
+    'amount_due': Decimal('1500.10'),
+    'created_date': datetime(2024, 3, 1, 12, 30, tzinfo=timezone.utc),
+    'due_date': date(2024, 4, 1),
+    'customer_uuid': UUID(int=7),
+    'customer_name': None,
+}]
+
+QUERY = 'SELECT * FROM public."Invoices" WHERE customer_id = $1'
+
+
+def make_manager(rows=ROWS):
+    connection = FakeConnection(rows)
+    manager = DatabaseManager("postgresql://user:pw@localhost:5432/cashapp", redis_client=FakeRedis())
+    manager.pool = FakePool(connection)
+    return manager, connection
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_database():
+    manager, connection = make_manager()
+
+    first = await manager.execute_query(QUERY, 'CUST-1', cache_ttl=60)
+    second = await manager.execute_query(QUERY, 'CUST-1', cache_ttl=60)
+
+    assert first == second == ROWS
+    assert len(connection.fetches) == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_key_depends_on_arguments():
+    manager, connection = make_manager()
+
+    await manager.execute_query(QUERY, 'CUST-1', cache_ttl=60)
+    await manager.execute_query(QUERY, 'CUST-2', cache_ttl=60)
+
+    assert len(connection.fetches) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_values_keep_their_types():
+    manager, _ = make_manager()
+
+    await manager.execute_query(QUERY, 'CUST-1', cache_ttl=60)
+    row, = await manager.execute_query(QUERY, 'CUST-1', cache_ttl=60)
+
+    assert isinstance(row['amount_due'], Decimal) and row['amount_due'] == Decimal('1500.10')
+    assert row['created_date'] == ROWS[0]['created_date']
+    assert row['created_date'].tzinfo is not None
+    assert type(row['due_date']) is date
+    assert row['customer_uuid'] == UUID(int=7)
+    assert row['customer_name'] is None
+
+
+@pytest.mark.asyncio
+async def test_uncacheable_types_are_not_cached():
+    manager, connection = make_manager(rows=[{'value': object()}])
+
+    await manager.execute_query(QUERY, 'CUST-1', cache_ttl=60)
+    await manager.execute_query(QUERY, 'CUST-1', cache_ttl=60)
+
+    assert len(connection.fetches) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('command', [
+    'UPDATE invoices SET status = $1 WHERE invoice_id = $2',
+    'DELETE FROM "Invoices" WHERE invoice_id = $1',
+    'WITH paid AS (UPDATE public.invoices SET status = $1 RETURNING invoice_id) '
+    'INSERT INTO audit_log (invoice_id) SELECT invoice_id FROM paid',
+])
+async def test_write_invalidates_cached_reads(command):
+    manager, connection = make_manager()
+
+    await manager.execute_query(QUERY, 'CUST-1', cache_ttl=60)
+    await manager.execute_command(command, 'paid', 'INV-1')
+    await manager.execute_query(QUERY, 'CUST-1', cache_ttl=60)
+
+    assert len(connection.fetches) == 2
+
+
+@pytest.mark.asyncio
+async def test_write_to_other_table_keeps_cache():
+    manager, connection = make_manager()
+
+    await manager.execute_query(QUERY, 'CUST-1', cache_ttl=60)
+    await manager.execute_command('UPDATE payments SET status = $1', 'matched')
+    await manager.execute_query(QUERY, 'CUST-1', cache_ttl=60)
+
+    assert len(connection.fetches) == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_tables_tag_extra_dependencies():
+    manager, connection = make_manager()
+    query = 'SELECT * FROM invoices i, customers c WHERE i.customer_id = c.id'
+
+    await manager.execute_query(query, cache_ttl=60, cache_tables=['customers'])
+    await manager.execute_command('UPDATE customers SET name = $1', 'Acme')
+    await manager.execute_query(query, cache_ttl=60, cache_tables=['customers'])
+
+    assert len(connection.fetches) == 2
+
+
+def test_table_references_are_normalized():
+    assert _normalize_table('public."Invoices"') == 'invoices'
+    assert _normalize_table('"public" . invoices') == 'invoices'
+    assert _referenced_tables(_READ_TABLES_RE, 'SELECT 1 FROM a JOIN ONLY s.B ON true') == {'a', 'b'}
+    assert _referenced_tables(_WRITE_TABLES_RE, 'TRUNCATE TABLE "Payments"') == {'payments'}
@@ -0,0 +1,144 @@
+# tests/unit/test_database_copy.py
+"""
+Unit tests for DatabaseManager.execute_transaction batching and the COPY fast path
+"""
+
+import pytest
+
+from shared.database import COPY_THRESHOLD, DatabaseManager, _COPYABLE_INSERT_RE
+from shared.exceptions import CashAppException
+
+
+class FakeTransaction:
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.connection.calls.append(('rollback',) if exc_type else ('commit',))
+        return False
+
+
+class FakeConnection:
+    """Records how each statement of a transaction was sent"""
+
+    def __init__(self, fail_copy=False):
+        self.calls = []
+        self.fail_copy = fail_copy
+
+    def transaction(self):
+        return FakeTransaction(self)
+
+    async def execute(self, command, *args):
+        self.calls.append(('execute', command, args))
+
+    async def executemany(self, command, records):
+        self.calls.append(('executemany', command, list(records)))
+
+    async def copy_records_to_table(self, table, records, columns, schema_name=None):
+        if self.fail_copy:
+            raise RuntimeError("copy failed")
+        self.calls.append(('copy', schema_name, table, tuple(columns), list(records)))
+
+
+class FakePool:
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def acquire(self, timeout=None):
+        return self.connection
+
+    async def release(self, connection):
+        pass
+
+
+def make_manager(connection):
+    manager = DatabaseManager("postgresql://user:pw@localhost:5432/cashapp")
+    manager.pool = FakePool(connection)
+    return manager
+
+
+def rows(count):
+    return [(f'T-{i}', i) for i in range(count)]
+
+
+@pytest.mark.parametrize('command, copyable', [
+    ('INSERT INTO payments (transaction_id, amount) VALUES ($1, $2)', True),
+    ('insert into audit.payments(transaction_id,amount) values ($1,$2);', True),
+    ('INSERT INTO payments (transaction_id, amount) VALUES ($1, $2) ON CONFLICT DO NOTHING', False),
+    ('INSERT INTO payments (transaction_id, amount) VALUES ($1, now())', False),
+    ('INSERT INTO payments (transaction_id, amount) SELECT $1, $2', False),
+])
+def test_copyable_insert_pattern(command, copyable):
+    assert bool(_COPYABLE_INSERT_RE.match(command)) is copyable
+
+
+@pytest.mark.asyncio
+async def test_large_plain_insert_group_goes_through_copy():
+    connection = FakeConnection()
+    command = 'INSERT INTO audit.payments (transaction_id, amount) VALUES ($1, $2)'
+    records = rows(COPY_THRESHOLD + 1)
+
+    await make_manager(connection).execute_transaction([(command, *r) for r in records])
+
+    assert connection.calls == [
+        ('copy', 'audit', 'payments', ('transaction_id', 'amount'), records),
+        ('commit',),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_groups_at_or_below_threshold_use_executemany():
+    connection = FakeConnection()
+    command = 'INSERT INTO payments (transaction_id, amount) VALUES ($1, $2)'
+
+    await make_manager(connection).execute_transaction([(command, *r) for r in rows(COPY_THRESHOLD)])
+
+    assert [call[0] for call in connection.calls] == ['executemany', 'commit']
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('command', [
+    'INSERT INTO payments (transaction_id, amount) VALUES ($2, $1)',
+    'INSERT INTO payments (transaction_id, amount) VALUES ($1, $2) ON CONFLICT DO NOTHING',
+    'UPDATE payments SET amount = $2 WHERE transaction_id = $1',
+])
+async def test_large_groups_that_cannot_copy_fall_back_to_executemany(command):
+    connection = FakeConnection()
+    records = rows(COPY_THRESHOLD + 1)
+
+    await make_manager(connection).execute_transaction([(command, *r) for r in records])
+
+    assert connection.calls == [('executemany', command, records), ('commit',)]
+
+
+@pytest.mark.asyncio
+async def test_consecutive_statements_are_grouped_in_order():
+    connection = FakeConnection()
+    insert = 'INSERT INTO payments (transaction_id, amount) VALUES ($1, $2)'
+    update = 'UPDATE invoices SET status = $1 WHERE invoice_id = $2'
+
+    await make_manager(connection).execute_transaction([
+        (insert, 'T-1', 1), (insert, 'T-2', 2), (update, 'paid', 'INV-1'), (insert, 'T-3', 3)
+    ])
+
+    assert connection.calls == [
+        ('executemany', insert, [('T-1', 1), ('T-2', 2)]),
+        ('execute', update, ('paid', 'INV-1')),
+        ('execute', insert, ('T-3', 3)),
+        ('commit',),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_copy_failure_rolls_back_transaction():
+    connection = FakeConnection(fail_copy=True)
+    command = 'INSERT INTO payments (transaction_id, amount) VALUES ($1, $2)'
+
+    with pytest.raises(CashAppException) as exc_info:
+        await make_manager(connection).execute_transaction([(command, *r) for r in rows(COPY_THRESHOLD + 1)])
+
+    assert exc_info.value.error_code == "DATABASE_TRANSACTION_ERROR"
+    assert connection.calls == [('rollback',)]
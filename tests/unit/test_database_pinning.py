@@ -0,0 +1,121 @@
+# tests/unit/test_database_pinning.py
+"""
+Unit tests for DatabaseManager.pinned_connection and prepared_fetch
+"""
+
+import asyncio
+import pytest
+
+from shared.database import DatabaseManager
+from shared.exceptions import CashAppException
+
+
+class FakeStatement:
+    def __init__(self, sql):
+        self.sql = sql
+        self.calls = []
+
+    async def fetch(self, *args):
+        self.calls.append(args)
+        return [{'sql': self.sql, 'args': args}]
+
+
+class FakeConnection:
+    def __init__(self, name):
+        self.name = name
+        self.prepared = []
+        self.fetches = []
+
+    async def prepare(self, sql):
+        stmt = FakeStatement(sql)
+        self.prepared.append(stmt)
+        return stmt
+
+    async def fetch(self, sql, *args):
+        self.fetches.append((sql, args))
+        return [{'sql': sql, 'args': args}]
+
+    async def execute(self, command, *args):
+        return "INSERT 0 1"
+
+
+class FakePool:
+    """Hands out numbered connections, up to `size` at a time"""
+
+    def __init__(self, size=2):
+        self.free = asyncio.Queue()
+        for i in range(size):
+            self.free.put_nowait(FakeConnection(i))
+        self.acquired = 0
+
+    async def acquire(self, timeout=None):
+        connection = await asyncio.wait_for(self.free.get(), timeout)
+        self.acquired += 1
+        return connection
+
+    async def release(self, connection):
+        self.free.put_nowait(connection)
+
+
+def make_manager(size=2):
+    manager = DatabaseManager("postgresql://user:pw@localhost:5432/cashapp")
+    manager.pool = FakePool(size)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_pinned_block_reuses_one_connection_and_statement():
+    manager = make_manager()
+
+    async with manager.pinned_connection() as conn:
+        for i in range(5):
+            rows = await manager.prepared_fetch('by_id', 'SELECT * FROM invoices WHERE id = $1', i)
+            assert rows == [{'sql': 'SELECT * FROM invoices WHERE id = $1', 'args': (i,)}]
+        await manager.execute_command('UPDATE invoices SET status = $1', 'paid')
+
+    assert manager.pool.acquired == 1
+    assert len(conn.prepared) == 1
+    assert len(conn.prepared[0].calls) == 5
+    # Released when the block exits
+    assert manager.pool.free.qsize() == 2
+
+
+@pytest.mark.asyncio
+async def test_prepared_fetch_without_pin_acquires_per_call():
+    manager = make_manager()
+
+    await manager.prepared_fetch('by_id', 'SELECT 1 WHERE $1', 1)
+    await manager.prepared_fetch('by_id', 'SELECT 1 WHERE $1', 2)
+
+    assert manager.pool.acquired == 2
+    assert manager.pool.free.qsize() == 2
+
+
+@pytest.mark.asyncio
+async def test_child_tasks_do_not_share_the_pinned_connection():
+    manager = make_manager()
+
+    async def child():
+        async with manager.get_connection() as conn:
+            return conn
+
+    async with manager.pinned_connection() as pinned:
+        child_conn = await asyncio.create_task(child())
+
+    assert child_conn is not pinned
+    assert manager.pool.acquired == 2
+
+
+@pytest.mark.asyncio
+async def test_pinned_connection_honours_acquire_timeout():
+    manager = make_manager(size=1)
+
+    async with manager.pinned_connection():
+        async def other_task():
+            async with manager.pinned_connection(timeout=0.01):
+                pass
+
+        with pytest.raises(CashAppException) as exc_info:
+            await asyncio.create_task(other_task())
+
+    assert exc_info.value.error_code == "DATABASE_POOL_EXHAUSTED"
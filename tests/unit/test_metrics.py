@@ -0,0 +1,151 @@
+# tests/unit/test_metrics.py
+"""
+Unit tests for shared.metrics request recording
+"""
+
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from shared import metrics as metrics_module
+from shared.metrics import MetricsCollector, make_cached_metrics_app, metrics_middleware
+
+
+def request_count(service, endpoint, method="POST", status="success"):
+    return REGISTRY.get_sample_value('cashapp_requests_total', {
+        'service': service, 'endpoint': endpoint, 'method': method, 'status': status
+    }) or 0.0
+
+
+def test_record_request_applies_inline_without_drain_task():
+    collector = MetricsCollector("test-inline")
+
+    collector.record_request("/inline", 0.01)
+
+    assert request_count("test-inline", "/inline") == 1
+    assert not collector._pending
+
+
+@pytest.mark.asyncio
+async def test_drain_task_applies_queued_observations():
+    collector = MetricsCollector("test-drain")
+    collector.start()
+
+    for _ in range(300):
+        collector.record_request("/drain", 0.01)
+    # Queued, not yet applied on the request path
+    assert request_count("test-drain", "/drain") == 0
+
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert request_count("test-drain", "/drain") == 300
+
+    await collector.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aclose_stops_drain_task_and_flushes_queue():
+    collector = MetricsCollector("test-close")
+    collector.start()
+    task = collector._drain_task
+
+    collector.record_request("/close", 0.01)
+    await collector.aclose()
+
+    assert task.done()
+    assert request_count("test-close", "/close") == 1
+    # After shutdown observations are applied immediately again
+    collector.record_request("/close", 0.01)
+    assert request_count("test-close", "/close") == 2
+
+
+@pytest.mark.asyncio
+async def test_request_queue_is_bounded(monkeypatch):
+    monkeypatch.setattr(metrics_module, 'REQUEST_QUEUE_SIZE', 10)
+    collector = MetricsCollector("test-bounded")
+    collector.start()
+
+    for _ in range(25):
+        collector.record_request("/bounded", 0.01)
+
+    assert len(collector._pending) == 10
+    await collector.aclose()
+    assert request_count("test-bounded", "/bounded") == 10
+
+
+def test_middleware_labels_requests_by_route_template():
+    collector = MetricsCollector("test-middleware")
+    app = FastAPI()
+    app.middleware("http")(metrics_middleware(lambda: collector))
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"item_id": item_id}
+
+    with TestClient(app) as client:
+        assert client.get("/items/a").status_code == 200
+        assert client.get("/items/b").status_code == 200
+        assert client.get("/missing").status_code == 404
+
+    assert request_count("test-middleware", "/items/{item_id}", method="GET") == 2
+    assert request_count("test-middleware", "unmatched", method="GET", status="error") == 1
+
+
+async def run_asgi(app, scope, messages):
+    """Drive an ASGI app with queued receive messages; return what it sent"""
+    inbox = list(messages)
+    sent = []
+
+    async def receive():
+        return inbox.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_cached_metrics_app_serves_http():
+    app = make_cached_metrics_app(cache_seconds=60)
+
+    sent = await run_asgi(app, {'type': 'http', 'method': 'GET', 'path': '/'}, [{'type': 'http.request'}])
+
+    assert sent[0]['type'] == 'http.response.start' and sent[0]['status'] == 200
+    assert b'cashapp_requests_total' in sent[1]['body']
+
+
+@pytest.mark.asyncio
+async def test_cached_metrics_app_acknowledges_lifespan():
+    app = make_cached_metrics_app()
+
+    sent = await run_asgi(app, {'type': 'lifespan'}, [
+        {'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}
+    ])
+
+    assert [m['type'] for m in sent] == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+
+
+@pytest.mark.asyncio
+async def test_cached_metrics_app_rejects_websockets():
+    app = make_cached_metrics_app()
+
+    sent = await run_asgi(app, {'type': 'websocket', 'path': '/'}, [{'type': 'websocket.connect'}])
+
+    assert [m['type'] for m in sent] == ['websocket.close']
+
+
+def test_cached_metrics_app_runs_standalone_and_mounted():
+    standalone = make_cached_metrics_app()
+    with TestClient(standalone) as client:
+        assert client.get("/").status_code == 200
+
+    app = FastAPI()
+    app.mount("/metrics", make_cached_metrics_app())
+    with TestClient(app) as client:
+        response = client.get("/metrics/")
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
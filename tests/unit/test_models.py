@@ -0,0 +1,141 @@
+# tests/unit/test_models.py
+"""
+Unit tests for the frozen shared models and their msgspec mirrors
+"""
+
+import msgspec
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from pydantic import ValidationError
+
+from shared.models import Invoice, MatchResult
+from shared.models_fast import (
+    InvoiceFast, MatchResultFast, PaymentTransactionFast,
+    invoices_decoder, match_results_decoder, payment_transactions_decoder,
+    to_invoices, to_match_results, to_payment_transactions
+)
+
+
+def make_invoice(**overrides):
+    data = {
+        'invoice_id': 'INV-1', 'amount_due': Decimal('100.00'), 'currency': 'usd',
+        'customer_id': 'CUST-1', 'original_amount': Decimal('100.00'),
+        'status': 'open', 'created_date': datetime(2024, 1, 1),
+    }
+    data.update(overrides)
+    return Invoice(**data)
+
+
+def make_match_result(**overrides):
+    data = {
+        'transaction_id': 'T-1', 'status': 'matched', 'log_entry': 'matched',
+        'matched_pairs': {'INV-1': Decimal('60.00'), 'INV-2': Decimal('40.00')},
+    }
+    data.update(overrides)
+    return MatchResult(**data)
+
+
+def test_invoice_is_immutable():
+    invoice = make_invoice()
+
+    with pytest.raises(ValidationError):
+        invoice.amount_due = Decimal('0')
+    assert invoice.currency == 'USD'
+    assert hash(invoice) == hash(make_invoice())
+
+
+def test_match_result_is_immutable_and_derives_totals():
+    result = make_match_result()
+
+    with pytest.raises(ValidationError):
+        result.status = 'unmatched'
+    assert result.matched_invoice_ids == ('INV-1', 'INV-2')
+    assert result.total_applied == Decimal('100.00')
+
+
+def test_match_result_copy_recomputes_properties():
+    result = make_match_result()
+
+    updated = result.model_copy(update={'matched_pairs': {'INV-3': Decimal('5.50')}})
+
+    assert updated.matched_invoice_ids == ('INV-3',)
+    assert updated.total_applied == Decimal('5.50')
+    assert result.total_applied == Decimal('100.00')
+
+
+PAYMENTS_JSON = b'''[
+    {"transaction_id": "T-1", "source_account_ref": "ACC-1", "amount": "250.00",
+     "currency": "eur", "value_date": "2024-03-01T10:00:00",
+     "associated_document_uris": ["blob://a.pdf"]},
+    {"transaction_id": "T-2", "source_account_ref": "ACC-1", "amount": "10.5",
+     "currency": "EUR", "value_date": "2024-03-02T10:00:00",
+     "created_at": "2024-03-02T11:00:00"}
+]'''
+
+
+def test_payment_batch_decodes_and_converts():
+    rows = payment_transactions_decoder.decode(PAYMENTS_JSON)
+
+    assert isinstance(rows[0], PaymentTransactionFast)
+    assert rows[0].amount == Decimal('250.00')
+    assert rows[0].associated_document_uris == ('blob://a.pdf',)
+
+    payments = to_payment_transactions(rows)
+
+    assert [p.transaction_id for p in payments] == ['T-1', 'T-2']
+    assert payments[0].currency == 'EUR'
+    assert payments[0].processing_status == 'pending'
+    # Unset timestamps take the model default, explicit ones are kept
+    assert isinstance(payments[0].created_at, datetime)
+    assert payments[1].created_at == datetime(2024, 3, 2, 11, 0)
+    assert rows[1].to_model().amount == payments[1].amount == Decimal('10.50')
+
+
+def test_invoice_batch_converts_to_frozen_models():
+    rows = invoices_decoder.decode(b'''[
+        {"invoice_id": "INV-1", "customer_id": "C-1", "amount_due": "99.99",
+         "original_amount": "120.00", "currency": "gbp", "status": "open",
+         "created_date": "2024-01-05T00:00:00", "due_date": null}
+    ]''')
+
+    invoice, = to_invoices(rows)
+
+    assert isinstance(rows[0], InvoiceFast)
+    assert invoice == rows[0].to_model()
+    assert invoice.amount_due == Decimal('99.99') and invoice.currency == 'GBP'
+    assert invoice.due_date is None
+
+
+def test_match_result_batch_converts():
+    rows = match_results_decoder.decode(b'''[
+        {"transaction_id": "T-1", "status": "partially_matched", "log_entry": "short",
+         "matched_pairs": {"INV-1": "80.00"}, "unapplied_amount": "0",
+         "confidence_score": 0.8, "created_at": "2024-03-01T12:00:00"}
+    ]''')
+
+    result, = to_match_results(rows)
+
+    assert isinstance(rows[0], MatchResultFast)
+    assert result.total_applied == Decimal('80.00')
+    assert result.created_at == datetime(2024, 3, 1, 12, 0)
+
+
+def test_model_rules_apply_on_conversion_not_decode():
+    # msgspec only checks structure; the Pydantic bounds reject the value
+    rows = invoices_decoder.decode(b'''[
+        {"invoice_id": "INV-1", "customer_id": "C-1", "amount_due": "-1",
+         "original_amount": "120.00", "currency": "GBP", "status": "open",
+         "created_date": "2024-01-05T00:00:00"}
+    ]''')
+
+    with pytest.raises(ValidationError):
+        to_invoices(rows)
+
+
+def test_decode_rejects_malformed_currency():
+    with pytest.raises(msgspec.ValidationError):
+        payment_transactions_decoder.decode(
+            b'[{"transaction_id": "T", "source_account_ref": "A", "amount": "1",'
+            b' "currency": "EURO", "value_date": "2024-03-01T10:00:00"}]'
+        )
@@ -0,0 +1,273 @@
+# tests/unit/test_monitoring.py
+"""
+Unit tests for shared.monitoring telemetry and alerting
+"""
+
+import asyncio
+import gzip
+import json
+
+import httpx
+import pytest
+
+from shared import monitoring
+from shared.exceptions import CashAppException
+from shared.monitoring import AlertManager, ApplicationInsights, MetricsCollector, TelemetryRingBuffer
+
+
+@pytest.fixture
+def telemetry_transport(monkeypatch):
+    """Route telemetry exports through a mock transport; set .handler per test"""
+    class Transport:
+        handler = staticmethod(lambda request: httpx.Response(200))
+        requests = []
+
+        def __call__(self, request):
+            self.requests.append(request)
+            return self.handler(request)
+
+    transport = Transport()
+    monkeypatch.setattr(monitoring, '_telemetry_client',
+                        httpx.AsyncClient(transport=httpx.MockTransport(transport)))
+    return transport
+
+
+@pytest.mark.asyncio
+async def test_flush_exports_buffered_items(telemetry_transport):
+    app_insights = ApplicationInsights("key")
+    app_insights.track_event("processed", {"transaction_id": "T-1"})
+    app_insights.track_metric("latency_ms", 12.5)
+
+    await app_insights.aclose()
+    await app_insights.flush()
+
+    assert len(app_insights.telemetry_buffer) == 0
+    envelopes = json.loads(gzip.decompress(telemetry_transport.requests[0].content))
+    assert [e['data']['baseType'] for e in envelopes] == ['EventData', 'MetricData']
+
+
+@pytest.mark.asyncio
+async def test_failed_export_keeps_items_buffered(telemetry_transport):
+    def fail(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    telemetry_transport.handler = fail
+    app_insights = ApplicationInsights("key")
+    app_insights.track_event("first")
+    app_insights.track_event("second")
+    await app_insights.aclose()
+
+    with pytest.raises(httpx.ConnectError):
+        await app_insights.flush()
+
+    assert len(app_insights.telemetry_buffer) == 2
+    assert [item['name'] for item in app_insights.telemetry_buffer.take(2)] == ['first', 'second']
+
+
+@pytest.mark.asyncio
+async def test_failed_encode_keeps_items_buffered(telemetry_transport, monkeypatch):
+    app_insights = ApplicationInsights("key")
+    app_insights.track_event("event")
+    await app_insights.aclose()
+
+    def broken_encode(batch):
+        raise ValueError("cannot encode")
+
+    monkeypatch.setattr(app_insights, '_encode', broken_encode)
+    with pytest.raises(ValueError):
+        await app_insights.flush()
+
+    assert len(app_insights.telemetry_buffer) == 1
+    assert not telemetry_transport.requests
+
+
+def test_ring_buffer_drops_oldest_on_overflow():
+    buffer = TelemetryRingBuffer(3)
+    for i in range(5):
+        buffer.append({'n': i})
+
+    assert len(buffer) == 3
+    assert buffer.dropped == 2
+    assert buffer.take(10) == [{'n': 2}, {'n': 3}, {'n': 4}]
+    assert buffer.take(1) == []
+
+
+def test_ring_buffer_requeue_puts_items_back_in_order():
+    buffer = TelemetryRingBuffer(5)
+    for i in range(4):
+        buffer.append({'n': i})
+
+    taken = buffer.take(2)
+    buffer.append({'n': 4})
+    buffer.requeue(taken)
+
+    assert buffer.dropped == 0
+    assert [item['n'] for item in buffer.take(5)] == [0, 1, 2, 3, 4]
+
+
+def test_ring_buffer_requeue_keeps_newest_when_full():
+    buffer = TelemetryRingBuffer(3)
+    for i in range(3):
+        buffer.append({'n': i})
+    taken = buffer.take(2)
+    buffer.append({'n': 3})
+
+    buffer.requeue(taken)
+
+    # Only one slot was free; the older of the two requeued items is dropped
+    assert buffer.dropped == 1
+    assert [item['n'] for item in buffer.take(3)] == [1, 2, 3]
+
+
+class StaticHealthChecker:
+    """Stands in for ComprehensiveHealthChecker with a fixed summary"""
+
+    async def get_recent_health(self, max_age_seconds):
+        return {'overall_status': 'healthy', 'checks': {}, 'summary': {'total_checks': 1, 'unhealthy_checks': 0}}
+
+
+def make_alert_manager():
+    return AlertManager(MetricsCollector("alerts-test"), StaticHealthChecker())
+
+
+@pytest.mark.asyncio
+async def test_rule_outcome_is_reused_between_evaluations():
+    alert_manager = make_alert_manager()
+    calls = []
+
+    def condition(context):
+        calls.append(context)
+        return False
+
+    alert_manager.add_alert_rule('slow_changing', condition, eval_every=3)
+
+    for _ in range(3):
+        await alert_manager.check_alerts()
+    assert len(calls) == 1
+
+    await alert_manager.check_alerts()
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_rules_are_evaluated_every_pass_by_default():
+    alert_manager = make_alert_manager()
+    calls = []
+    alert_manager.add_alert_rule('every_pass', lambda c: calls.append(c) or False)
+
+    await alert_manager.check_alerts()
+    await alert_manager.check_alerts()
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_positive_outcome_still_respects_cooldown():
+    alert_manager = make_alert_manager()
+    alert_manager.add_alert_rule('always', lambda c: True, cooldown_minutes=15, eval_every=5)
+
+    fired = [await alert_manager.check_alerts() for _ in range(3)]
+
+    assert [len(alerts) for alerts in fired] == [1, 0, 0]
+
+
+class FailingHealthChecker:
+    """Health source that is down for the whole test"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def get_recent_health(self, max_age_seconds):
+        self.calls += 1
+        raise ConnectionError("health store unreachable")
+
+    async def aclose(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_check_alerts_raises_when_context_is_unavailable():
+    alert_manager = AlertManager(MetricsCollector("alerts-test"), FailingHealthChecker())
+    alert_manager.add_alert_rule('any', lambda c: True)
+
+    with pytest.raises(CashAppException) as exc_info:
+        await alert_manager.check_alerts()
+
+    assert exc_info.value.error_code == "ALERT_CONTEXT_ERROR"
+
+
+@pytest.mark.asyncio
+async def test_monitoring_loop_backs_off_after_failures(monkeypatch):
+    health_checker = FailingHealthChecker()
+    metrics_collector = MetricsCollector("loop-test")
+    alert_manager = AlertManager(metrics_collector, health_checker)
+    alert_manager.add_alert_rule('any', lambda c: True)
+    monkeypatch.setattr(monitoring, '_ctx', monitoring.MonitoringContext(
+        app_insights=ApplicationInsights(None),
+        health_checker=health_checker,
+        metrics_collector=metrics_collector,
+        business_tracker=monitoring.BusinessMetricsTracker(metrics_collector),
+        alert_manager=alert_manager
+    ))
+    monkeypatch.setattr(monitoring.random, 'uniform', lambda a, b: 0.0)
+
+    loop_task = asyncio.create_task(monitoring.start_monitoring_loop(0.01))
+    await asyncio.sleep(0.35)
+    monitoring.stop_monitoring_loop()
+    await loop_task
+
+    # Backoff sleeps 0.01, 0.02, 0.04, 0.08, 0.16 s after successive failures;
+    # without it a check would run every 0.01 s tick
+    assert 3 <= health_checker.calls <= 7
+
+
+@pytest.mark.parametrize('op, threshold, value, fires', [
+    ('>', 0.9, 0.95, True),
+    ('>', 0.9, 0.9, False),
+    ('>=', 90, 90, True),
+    ('<', 10, 0.5, True),
+    ('==', 'unhealthy', 'unhealthy', True),
+    ('!=', 'healthy', 'healthy', False),
+])
+def test_threshold_rule_compares_context_value(op, threshold, value, fires):
+    alert_manager = make_alert_manager()
+
+    alert_manager.add_threshold_rule('rule', 'value', op, threshold)
+
+    assert alert_manager.alert_rules['rule']['condition']({'value': value}) is fires
+
+
+def test_threshold_rule_quotes_key_and_string_threshold():
+    alert_manager = make_alert_manager()
+
+    alert_manager.add_threshold_rule('quoted', "it's", '==', "x') or True or ('")
+
+    condition = alert_manager.alert_rules['quoted']['condition']
+    assert condition({"it's": 'other'}) is False
+    assert condition({"it's": "x') or True or ('"}) is True
+
+
+@pytest.mark.parametrize('op, key, threshold', [
+    ('=>', 'value', 1),
+    ('and', 'value', 1),
+    ('>', 'value', float('nan')),
+    ('>', 'value', float('inf')),
+    ('>', 1, 1),
+])
+def test_threshold_rule_rejects_invalid_arguments(op, key, threshold):
+    alert_manager = make_alert_manager()
+
+    with pytest.raises(ValueError):
+        alert_manager.add_threshold_rule('bad', key, op, threshold)
+    assert 'bad' not in alert_manager.alert_rules
+
+
+@pytest.mark.asyncio
+async def test_threshold_rule_fires_from_check_alerts():
+    alert_manager = make_alert_manager()
+    alert_manager.add_threshold_rule('any_unhealthy', 'unhealthy_checks', '>', 0)
+    alert_manager.add_threshold_rule('all_checks', 'total_checks', '>=', 1)
+
+    alerts = await alert_manager.check_alerts()
+
+    assert [alert['rule_name'] for alert in alerts] == ['all_checks']
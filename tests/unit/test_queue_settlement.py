@@ -0,0 +1,130 @@
+# tests/unit/test_queue_settlement.py
+"""
+Unit tests for RabbitMQManager._settle_completed acknowledgement ordering
+"""
+
+import asyncio
+import pytest
+
+pytest.importorskip("kombu")
+pytest.importorskip("pika")
+pytest.importorskip("backoff")
+
+from shared.queue_rabbitmq import (
+    RabbitMQManager, DISPOSITION_ACK, DISPOSITION_REJECT, DISPOSITION_REQUEUE
+)
+
+
+class FakeChannel:
+    def __init__(self, log):
+        self.log = log
+
+    def basic_ack(self, tag, multiple=False):
+        self.log.append(('basic_ack', tag, multiple))
+
+    def basic_reject(self, tag, requeue=True):
+        self.log.append(('basic_reject', tag, requeue))
+
+
+class FakeMessage:
+    def __init__(self, tag, log):
+        self.delivery_tag = tag
+        self.log = log
+
+    def ack(self):
+        self.log.append(('ack', self.delivery_tag))
+
+    def reject(self, requeue=False):
+        self.log.append(('reject', self.delivery_tag, requeue))
+
+
+class Deliveries:
+    """In-flight processing tasks whose outcome each test decides"""
+
+    def __init__(self):
+        self.log = []
+        self.channel = FakeChannel(self.log)
+        self.in_flight = {}
+        self.gates = {}
+
+    def add(self, tag, disposition=DISPOSITION_ACK, fail=False):
+        gate = asyncio.Event()
+        message = FakeMessage(tag, self.log)
+
+        async def process():
+            await gate.wait()
+            if fail:
+                raise RuntimeError("handler crashed")
+            return disposition, message
+
+        self.gates[tag] = gate
+        self.in_flight[tag] = asyncio.create_task(process())
+
+    async def finish(self, *tags):
+        for tag in tags:
+            self.gates[tag].set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    def settle(self):
+        RabbitMQManager()._settle_completed(self.channel, self.in_flight)
+        settled, self.log[:] = list(self.log), []
+        return settled
+
+
+@pytest.mark.asyncio
+async def test_out_of_order_completion_never_acks_unfinished_delivery():
+    deliveries = Deliveries()
+    for tag in (1, 2, 3, 4):
+        deliveries.add(tag)
+
+    await deliveries.finish(2, 3)
+    # 1 is still processing, so 2 and 3 must not be covered by a multiple-ack
+    assert deliveries.settle() == [('ack', 2), ('ack', 3)]
+    assert set(deliveries.in_flight) == {1, 4}
+
+    await deliveries.finish(1)
+    assert deliveries.settle() == [('basic_ack', 1, True)]
+
+    await deliveries.finish(4)
+    assert deliveries.settle() == [('basic_ack', 4, True)]
+    assert not deliveries.in_flight
+
+
+@pytest.mark.asyncio
+async def test_finished_run_below_pending_delivery_is_acked_cumulatively():
+    deliveries = Deliveries()
+    for tag in (1, 2, 3, 4):
+        deliveries.add(tag)
+
+    await deliveries.finish(1, 2, 4)
+
+    assert deliveries.settle() == [('ack', 4), ('basic_ack', 2, True)]
+
+
+@pytest.mark.asyncio
+async def test_rejected_delivery_below_acked_ones_is_not_covered_by_multiple_ack():
+    deliveries = Deliveries()
+    deliveries.add(1)
+    deliveries.add(2, DISPOSITION_REJECT)
+    deliveries.add(3)
+    deliveries.add(4, DISPOSITION_REQUEUE)
+    deliveries.add(5)
+
+    await deliveries.finish(1, 2, 3, 4, 5)
+
+    assert deliveries.settle() == [
+        ('reject', 2, False), ('ack', 3), ('reject', 4, True), ('ack', 5),
+        ('basic_ack', 1, True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_crashed_handler_is_requeued_by_tag():
+    deliveries = Deliveries()
+    deliveries.add(1, fail=True)
+    deliveries.add(2)
+
+    await deliveries.finish(1, 2)
+
+    assert deliveries.settle() == [('basic_reject', 1, True), ('ack', 2)]